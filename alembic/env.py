@@ -14,7 +14,7 @@ from app.db.models.models import User
 # access to the values within the .ini file in use.
 config = context.config
 
-db_url = f"postgresql+asyncpg://{CONFIG.POSTGRES_USER}:{CONFIG.POSTGRES_PASSWORD}@db/{CONFIG.POSTGRES_DB}"
+db_url = f"postgresql+asyncpg://{CONFIG.POSTGRES_USER}:{CONFIG.POSTGRES_PASSWORD}@{CONFIG.POSTGRES_HOST}:{CONFIG.POSTGRES_PORT}/{CONFIG.POSTGRES_DB}"
 config.set_main_option("sqlalchemy.url", db_url)
 
 # Interpret the config file for Python logging.
@@ -0,0 +1,39 @@
+"""add user listing indexes
+
+Revision ID: 5c1e9a7d3b42
+Revises: 2f2b076ea09c
+Create Date: 2026-10-18 10:12:41.512734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e9a7d3b42'
+down_revision: Union[str, Sequence[str], None] = '2f2b076ea09c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built CONCURRENTLY so large auth_users tables stay writable meanwhile.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_auth_users_created_at_id', 'auth_users', ['created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_auth_users_role_created_at_id', 'auth_users', ['role', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_auth_users_inactive_created_at_id', 'auth_users', ['created_at', 'id'], unique=False, postgresql_where=sa.text('NOT is_active'), postgresql_concurrently=True)
+        op.create_index('ix_auth_users_username_pattern', 'auth_users', ['username'], unique=False, postgresql_ops={'username': 'text_pattern_ops'}, postgresql_concurrently=True)
+        op.create_index('ix_auth_users_email_pattern', 'auth_users', ['email'], unique=False, postgresql_ops={'email': 'text_pattern_ops'}, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_auth_users_email_pattern', table_name='auth_users', postgresql_concurrently=True)
+        op.drop_index('ix_auth_users_username_pattern', table_name='auth_users', postgresql_concurrently=True)
+        op.drop_index('ix_auth_users_inactive_created_at_id', table_name='auth_users', postgresql_concurrently=True)
+        op.drop_index('ix_auth_users_role_created_at_id', table_name='auth_users', postgresql_concurrently=True)
+        op.drop_index('ix_auth_users_created_at_id', table_name='auth_users', postgresql_concurrently=True)
@@ -0,0 +1,33 @@
+"""add user token version
+
+Revision ID: b7e3c5a1f920
+Revises: 9d4f2b6c8e10
+Create Date: 2026-10-18 14:21:09.517342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3c5a1f920'
+down_revision: Union[str, Sequence[str], None] = '9d4f2b6c8e10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A constant server default makes this a metadata-only change on PG 11+.
+    op.add_column('auth_users', sa.Column('token_version', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    with op.get_context().autocommit_block():
+        op.create_index('ix_auth_users_updated_at', 'auth_users', ['updated_at'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_auth_users_updated_at', table_name='auth_users', postgresql_concurrently=True)
+    op.drop_column('auth_users', 'token_version')
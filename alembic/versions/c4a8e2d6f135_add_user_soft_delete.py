@@ -0,0 +1,44 @@
+"""add user soft delete
+
+Revision ID: c4a8e2d6f135
+Revises: b7e3c5a1f920
+Create Date: 2026-10-18 16:02:44.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a8e2d6f135'
+down_revision: Union[str, Sequence[str], None] = 'b7e3c5a1f920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('auth_users', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    # Build the live-row unique indexes before dropping the old constraints so
+    # uniqueness is enforced throughout.
+    with op.get_context().autocommit_block():
+        op.create_index('uq_auth_users_username_live', 'auth_users', ['username'], unique=True, postgresql_where=sa.text('deleted_at IS NULL'), postgresql_concurrently=True)
+        op.create_index('uq_auth_users_email_live', 'auth_users', ['email'], unique=True, postgresql_where=sa.text('deleted_at IS NULL'), postgresql_concurrently=True)
+        op.create_index('ix_auth_users_deleted_at', 'auth_users', ['deleted_at'], unique=False, postgresql_where=sa.text('deleted_at IS NOT NULL'), postgresql_concurrently=True)
+    op.drop_constraint('auth_users_username_key', 'auth_users', type_='unique')
+    op.drop_constraint('auth_users_email_key', 'auth_users', type_='unique')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Soft-deleted rows may share a name with a live account; drop them first.
+    op.execute('DELETE FROM auth_users WHERE deleted_at IS NOT NULL')
+    op.create_unique_constraint('auth_users_email_key', 'auth_users', ['email'])
+    op.create_unique_constraint('auth_users_username_key', 'auth_users', ['username'])
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_auth_users_deleted_at', table_name='auth_users', postgresql_concurrently=True)
+        op.drop_index('uq_auth_users_email_live', table_name='auth_users', postgresql_concurrently=True)
+        op.drop_index('uq_auth_users_username_live', table_name='auth_users', postgresql_concurrently=True)
+    op.drop_column('auth_users', 'deleted_at')
@@ -0,0 +1,41 @@
+"""case insensitive user identity
+
+Revision ID: e1f7a3b9c524
+Revises: c4a8e2d6f135
+Create Date: 2026-10-18 17:35:12.604417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f7a3b9c524'
+down_revision: Union[str, Sequence[str], None] = 'c4a8e2d6f135'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Fails if live accounts already differ only by case; resolve those first:
+    SELECT lower(username) FROM auth_users WHERE deleted_at IS NULL
+    GROUP BY 1 HAVING count(*) > 1 (and the same for email).
+    """
+    with op.get_context().autocommit_block():
+        op.create_index('uq_auth_users_username_ci', 'auth_users', [sa.text('lower(username)')], unique=True, postgresql_where=sa.text('deleted_at IS NULL'), postgresql_concurrently=True)
+        op.create_index('uq_auth_users_email_ci', 'auth_users', [sa.text('lower(email)')], unique=True, postgresql_where=sa.text('deleted_at IS NULL'), postgresql_concurrently=True)
+        op.drop_index('uq_auth_users_email_live', table_name='auth_users', postgresql_concurrently=True)
+        op.drop_index('uq_auth_users_username_live', table_name='auth_users', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('uq_auth_users_username_live', 'auth_users', ['username'], unique=True, postgresql_where=sa.text('deleted_at IS NULL'), postgresql_concurrently=True)
+        op.create_index('uq_auth_users_email_live', 'auth_users', ['email'], unique=True, postgresql_where=sa.text('deleted_at IS NULL'), postgresql_concurrently=True)
+        op.drop_index('uq_auth_users_email_ci', table_name='auth_users', postgresql_concurrently=True)
+        op.drop_index('uq_auth_users_username_ci', table_name='auth_users', postgresql_concurrently=True)
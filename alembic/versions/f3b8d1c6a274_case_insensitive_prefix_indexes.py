@@ -0,0 +1,36 @@
+"""case insensitive prefix indexes
+
+Revision ID: f3b8d1c6a274
+Revises: e1f7a3b9c524
+Create Date: 2026-10-18 21:04:51.317208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d1c6a274'
+down_revision: Union[str, Sequence[str], None] = 'e1f7a3b9c524'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_auth_users_username_ci_pattern', 'auth_users', [sa.text('lower(username) text_pattern_ops')], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_auth_users_email_ci_pattern', 'auth_users', [sa.text('lower(email) text_pattern_ops')], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_auth_users_email_pattern', table_name='auth_users', postgresql_concurrently=True)
+        op.drop_index('ix_auth_users_username_pattern', table_name='auth_users', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_auth_users_username_pattern', 'auth_users', ['username'], unique=False, postgresql_ops={'username': 'text_pattern_ops'}, postgresql_concurrently=True)
+        op.create_index('ix_auth_users_email_pattern', 'auth_users', ['email'], unique=False, postgresql_ops={'email': 'text_pattern_ops'}, postgresql_concurrently=True)
+        op.drop_index('ix_auth_users_email_ci_pattern', table_name='auth_users', postgresql_concurrently=True)
+        op.drop_index('ix_auth_users_username_ci_pattern', table_name='auth_users', postgresql_concurrently=True)
@@ -1,37 +1,118 @@
 from typing import Annotated
-from fastapi import Depends
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import Depends, Request
+from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.rate_limit import (
+    LOGIN_GLOBAL,
+    LOGIN_PER_IP,
+    LOGIN_PER_USERNAME,
+    rate_limiter,
+)
 from app.core.security import verify_access_token
+from app.core.timing import timed
 from app.core.exceptions import (
     InvalidCredentialsError,
+    InvalidTokenError,
     InactiveUserError,
     InsufficientPermissionsError,
 )
-from app.db.connection import get_db
-from app.db.crud import get_user_by_username
+from app.db.connection import get_db, get_read_db
+from app.db.crud import get_user_by_username, get_principal_by_username
+from app.db.token_versions import token_versions
 from app.db.models.models import User
-from app.schemas.user import UserRole
+from app.schemas.user import UserRole, UserPrincipal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
+def _ensure_current_version(payload: dict, token_version: int, is_active: bool):
+    # Inactive users get the clearer InactiveUserError from the *_active_* checks.
+    version = payload.get("ver")
+    if is_active and version is not None and version != token_version:
+        raise InvalidTokenError("Token has been revoked")
+
+
+def _ensure_same_account(payload: dict, user_id: int):
+    # Deleted accounts free their username, so "sub" may now name someone else;
+    # only the id the token was issued for identifies its account.
+    if payload.get("uid") != user_id:
+        raise InvalidTokenError("Token has been revoked")
+
+
+def _principal_from_claims(payload: dict) -> UserPrincipal | None:
+    """Build the principal from the token alone if its version is still current.
+
+    Tokens are only issued to active users and every change to username, role
+    or is_active bumps token_version, so a current version implies the claims
+    are still accurate.
+    """
+    user_id, role, version = payload.get("uid"), payload.get("role"), payload.get("ver")
+    if user_id is None or role is None or version is None:
+        return None
+    if not token_versions.is_current(user_id, version):
+        return None
+    return UserPrincipal(
+        id=user_id,
+        username=payload["sub"],
+        role=role,
+        is_active=True,
+        token_version=version,
+    )
+
+
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> User:
-    payload = verify_access_token(token)
-    username: str | None = payload.get("sub")
-    if username is None:
-        raise InvalidCredentialsError("Could not validate credentials")
+    with timed("auth"):
+        payload = verify_access_token(token)
+        username: str | None = payload.get("sub")
+        if username is None:
+            raise InvalidCredentialsError("Could not validate credentials")
 
-    user = await get_user_by_username(db, username)
+        user = await get_user_by_username(db, username)
     if user is None:
         raise InvalidCredentialsError("User not found")
+    _ensure_same_account(payload, user.id)
+    _ensure_current_version(payload, user.token_version, user.is_active)
     return user
 
 
+async def get_current_principal(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+) -> UserPrincipal:
+    """Like get_current_user, but authorized from token claims when possible.
+
+    Falls back to the principal cache / database when the token predates
+    version claims or the version map does not (yet) confirm its version.
+    """
+    with timed("auth"):
+        payload = verify_access_token(token)
+        username: str | None = payload.get("sub")
+        if username is None:
+            raise InvalidCredentialsError("Could not validate credentials")
+
+        principal = _principal_from_claims(payload)
+        if principal is not None:
+            return principal
+        principal = await get_principal_by_username(db, username)
+    if principal is None:
+        raise InvalidCredentialsError("User not found")
+    _ensure_same_account(payload, principal.id)
+    _ensure_current_version(payload, principal.token_version, principal.is_active)
+    return principal
+
+
+async def get_current_active_principal(
+    principal: Annotated[UserPrincipal, Depends(get_current_principal)],
+) -> UserPrincipal:
+    if not principal.is_active:
+        raise InactiveUserError()
+    return principal
+
+
 async def get_current_active_user(
     current_user: Annotated[User, Depends(get_current_user)],
 ) -> User:
@@ -44,8 +125,8 @@ def require_role(allowed_roles: list[UserRole]):
     role_names = ", ".join([role.value for role in allowed_roles])
 
     async def role_checker(
-        current_user: Annotated[User, Depends(get_current_active_user)],
-    ) -> User:
+        current_user: Annotated[UserPrincipal, Depends(get_current_active_principal)],
+    ) -> UserPrincipal:
         if current_user.role not in [role.value for role in allowed_roles]:
             raise InsufficientPermissionsError(
                 f"Operation requires one of the following roles: {role_names}"
@@ -53,3 +134,16 @@ def require_role(allowed_roles: list[UserRole]):
         return current_user
 
     return role_checker
+
+
+async def enforce_login_rate_limit(
+    request: Request,
+    form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+) -> None:
+    """Reject excess login attempts before any password hash is computed."""
+    # Behind a proxy this is the real client only if the proxy is listed in
+    # SERVER_FORWARDED_ALLOW_IPS; otherwise all its clients share one key.
+    client_ip = request.client.host if request.client else "unknown"
+    await rate_limiter.check(LOGIN_PER_IP, client_ip)
+    await rate_limiter.check(LOGIN_PER_USERNAME, form_data.username.lower())
+    await rate_limiter.check(LOGIN_GLOBAL)
@@ -0,0 +1,49 @@
+from time import time
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.health import readiness
+from app.core.metrics import REGISTRY
+from app.core.responses import FastJSONResponse
+from app.db import connection
+
+router = APIRouter(tags=["monitoring"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Expose in-process metrics in the Prometheus text format"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/healthz")
+async def healthz():
+    """Liveness probe: the process is up and serving; performs no I/O"""
+    return FastJSONResponse({"status": "ok"})
+
+
+@router.get("/readyz")
+async def readyz():
+    """Readiness probe: 503 until warm-up finished and while the last database
+    check failed or went stale; serves cached state only"""
+    check = readiness.database
+    body = {
+        "status": "ready" if readiness.ready else "starting",
+        "warm_up_ms": round(readiness.warm_up_seconds * 1000, 1)
+        if readiness.warm_up_seconds is not None
+        else None,
+        "warm_up_error": readiness.warm_up_error,
+        "database": None
+        if check is None
+        else {
+            "ok": check.ok,
+            "latency_ms": round(check.latency_seconds * 1000, 1),
+            "age_s": round(time() - check.checked_at, 1),
+            "error": check.error,
+        },
+        "pool": connection.pool_status(connection.engine),
+    }
+    if readiness.warmed_up and not readiness.ready:
+        body["status"] = "unavailable"
+    return FastJSONResponse(body, status_code=200 if readiness.ready else 503)
@@ -1,20 +1,111 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
 from typing import Annotated
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import require_role
-from app.db.models.models import User
-from app.schemas.user import UserRole
+from app.core.responses import FastJSONResponse
+from app.db.connection import get_db, get_read_db, pin_reads_to_primary
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db import crud
+from app.schemas.user import (
+    UserRole,
+    UserPrincipal,
+    UserBatchUpdate,
+    UserBatchUpdateResult,
+    UserImportReport,
+    UserPage,
+    UserResponse,
+)
+from app.services import user_import
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
 @router.get("/admin-dashboard")
 async def admin_dashboard(
-    current_user: Annotated[User, Depends(require_role([UserRole.ADMIN]))],
+    current_user: Annotated[UserPrincipal, Depends(require_role([UserRole.ADMIN]))],
 ):
     """Admin-only endpoint - requires ADMIN role"""
-    return {
-        "message": f"Welcome to admin dashboard, {current_user.username}!",
-        "role": current_user.role,
-        "access_level": "administrator",
+    return FastJSONResponse(
+        {
+            "message": f"Welcome to admin dashboard, {current_user.username}!",
+            "role": current_user.role,
+            "access_level": "administrator",
+        }
+    )
+
+
+@router.get("/users", response_model=UserPage)
+async def list_users(
+    current_user: Annotated[UserPrincipal, Depends(require_role([UserRole.ADMIN]))],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+    role: UserRole | None = None,
+    is_active: bool | None = None,
+    username_prefix: Annotated[str | None, Query(max_length=50)] = None,
+    email_prefix: Annotated[str | None, Query(max_length=255)] = None,
+) -> UserPage:
+    """List users newest first with keyset pagination - requires ADMIN role
+
+    Pass the returned ``next_cursor`` back as ``cursor`` to fetch the next page.
+    ``approximate_total`` is a planner estimate, not an exact count.
+    """
+    filters = {
+        "role": role,
+        "is_active": is_active,
+        "username_prefix": username_prefix,
+        "email_prefix": email_prefix,
     }
+    after = decode_cursor(cursor) if cursor else None
+    users = await crud.list_users(db, limit=limit + 1, after=after, **filters)
+
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = encode_cursor(users[-1].created_at, users[-1].id)
+
+    return UserPage(
+        items=[UserResponse.model_validate(user) for user in users],
+        next_cursor=next_cursor,
+        approximate_total=await crud.approximate_user_count(db, **filters),
+    )
+
+
+@router.patch("/users", response_model=UserBatchUpdateResult)
+async def batch_update_users(
+    update: UserBatchUpdate,
+    response: Response,
+    current_user: Annotated[UserPrincipal, Depends(require_role([UserRole.ADMIN]))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> UserBatchUpdateResult:
+    """Deactivate/reactivate users or change their role in bulk - requires ADMIN role
+
+    Applied to every listed id in a single statement; the response lists the
+    ids that actually changed (unknown ids and no-op rows are skipped).
+    """
+    ids = await crud.batch_update_users(
+        db, update.ids, is_active=update.is_active, role=update.role
+    )
+    pin_reads_to_primary(response)
+    return UserBatchUpdateResult(updated=len(ids), ids=ids)
+
+
+@router.post("/users/import", response_model=UserImportReport)
+async def import_users(
+    request: Request,
+    current_user: Annotated[UserPrincipal, Depends(require_role([UserRole.ADMIN]))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    fmt: Annotated[str | None, Query(alias="format", pattern="^(ndjson|csv)$")] = None,
+    batch_size: Annotated[int | None, Query(ge=1, le=10000)] = None,
+) -> UserImportReport:
+    """Bulk-import users from an NDJSON or CSV request body - requires ADMIN role
+
+    The body is streamed and processed in batches, so arbitrarily large files
+    are never held in memory. The format defaults to the request Content-Type.
+    """
+    if fmt is None:
+        content_type = request.headers.get("content-type", "")
+        fmt = "csv" if "csv" in content_type else "ndjson"
+    lines = user_import.iter_lines(request.stream())
+    return await user_import.import_users(db, lines, fmt, batch_size)
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, BackgroundTasks, Depends, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from typing import Annotated
 
-from app.db.connection import get_db
+from app.api.dependencies import enforce_login_rate_limit
+from app.core.responses import ModelResponse
+from app.db.connection import get_db, get_sessionmaker
 from app.schemas.user import UserCreate, UserResponse, Token, RefreshTokenPayload
 from app.services import auth_service
 
@@ -21,18 +23,37 @@ async def register_user(
     return UserResponse.model_validate(new_user)
 
 
-@router.post("/login", response_model=Token)
+@router.post(
+    "/login", response_model=Token, dependencies=[Depends(enforce_login_rate_limit)]
+)
 async def login_user(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> Token:
+    background_tasks: BackgroundTasks,
+    sessionmaker: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_sessionmaker)
+    ],
+) -> ModelResponse:
     """Login user and return access/refresh tokens"""
-    return await auth_service.login_user(db, form_data.username, form_data.password)
+    # FastAPI still attaches background_tasks (the rehash) to a returned Response.
+    token = await auth_service.login_user(
+        db, form_data.username, form_data.password, background_tasks, sessionmaker
+    )
+    return ModelResponse(token)
 
 
 @router.post("/refresh", response_model=Token)
 async def refresh_token(
     refresh_data: RefreshTokenPayload, db: Annotated[AsyncSession, Depends(get_db)]
-) -> Token:
+) -> ModelResponse:
     """Refresh access token using refresh token"""
-    return await auth_service.refresh_access_token(db, refresh_data.refresh_token)
+    token = await auth_service.refresh_access_token(db, refresh_data.refresh_token)
+    return ModelResponse(token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_user(
+    refresh_data: RefreshTokenPayload, db: Annotated[AsyncSession, Depends(get_db)]
+) -> None:
+    """Revoke the refresh token and every token rotated from the same login"""
+    await auth_service.logout_user(db, refresh_data.refresh_token)
@@ -1,37 +1,114 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Response, status
 from typing import Annotated
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_current_active_user
+from app.api.dependencies import get_current_active_user, get_current_active_principal
 from app.db.models.models import User
-from app.db.connection import get_db
-from app.db.crud import update_user, delete_user
-from app.schemas.user import UserResponse, UserUpdate, DeleteAccountConfirmation
-from app.core.security import verify_password
+from app.db.connection import get_db, get_read_db, pin_reads_to_primary
+from app.db.crud import (
+    update_user,
+    delete_user,
+    get_principal_by_username,
+    get_user_by_username,
+    remember_principal,
+)
+from app.schemas.user import (
+    UserResponse,
+    UserUpdate,
+    UserPrincipal,
+    DeleteAccountConfirmation,
+)
+from app.core.security import verify_password_async
+from app.core.etag import etag_matches, user_etag
+from app.core.responses import ModelResponse
+from app.core.timing import timed
 from app.core.exceptions import (
+    InvalidCredentialsError,
     InvalidPasswordConfirmationError,
     InvalidConfirmationTextError,
+    PreconditionFailedError,
 )
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-@router.get("/me", response_model=UserResponse)
+def _profile_headers(etag: str) -> dict[str, str]:
+    # Per-user content: browsers may keep it, but must revalidate every time.
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+@router.get(
+    "/me",
+    response_model=UserResponse,
+    responses={304: {"description": "Profile unchanged since the given ETag"}},
+)
 async def get_current_user_profile(
-    current_user: Annotated[User, Depends(get_current_active_user)],
-):
-    """Get current authenticated user profile"""
-    return current_user
+    principal: Annotated[UserPrincipal, Depends(get_current_active_principal)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """Get current authenticated user profile
 
+    Send the returned ETag back in If-None-Match to get an empty 304 while the
+    profile is unchanged. That answer comes from the cached principal snapshot,
+    so it needs neither the database nor serialization once the cache is warm.
+    On other workers it can lag an update by PRINCIPAL_CACHE_TTL_SECONDS.
+    """
+    if if_none_match:
+        snapshot = principal
+        if snapshot.updated_at is None:
+            snapshot = await get_principal_by_username(db, principal.username)
+        if snapshot is not None and snapshot.updated_at is not None:
+            etag = user_etag(snapshot.id, snapshot.updated_at)
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers=_profile_headers(etag))
 
-@router.patch("/me", response_model=UserResponse)
+    current_user = await get_user_by_username(db, principal.username)
+    if current_user is None:
+        raise InvalidCredentialsError("User not found")
+    remember_principal(current_user)
+    with timed("serialize"):
+        return ModelResponse(
+            UserResponse.model_validate(current_user),
+            headers=_profile_headers(
+                user_etag(current_user.id, current_user.updated_at)
+            ),
+        )
+
+
+@router.patch(
+    "/me",
+    response_model=UserResponse,
+    responses={412: {"description": "If-Match does not match the current ETag"}},
+)
 async def update_profile(
     user_update: UserUpdate,
     current_user: Annotated[User, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
-):
+    if_match: Annotated[str | None, Header()] = None,
+) -> ModelResponse:
+    """Update the current user's profile
+
+    With If-Match, the update only applies if the profile still has that ETag;
+    the row is locked while checking so concurrent writers cannot slip in.
+    """
+    if if_match is not None:
+        with timed("db"):
+            await db.refresh(current_user, with_for_update=True)
+        etag = user_etag(current_user.id, current_user.updated_at)
+        if not etag_matches(if_match, etag, weak=False):
+            raise PreconditionFailedError()
+
     updated_user = await update_user(db, current_user, user_update)
-    return updated_user
+    with timed("serialize"):
+        response = ModelResponse(
+            UserResponse.model_validate(updated_user),
+            headers=_profile_headers(
+                user_etag(updated_user.id, updated_user.updated_at)
+            ),
+        )
+    pin_reads_to_primary(response)
+    return response
 
 
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
@@ -40,7 +117,9 @@ async def delete_profile(
     current_user: Annotated[User, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
 ):
-    if not verify_password(confirmation.password, current_user.hashed_password):
+    if not await verify_password_async(
+        confirmation.password, current_user.hashed_password
+    ):
         raise InvalidPasswordConfirmationError()
 
     if (
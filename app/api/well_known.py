@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Request, Response
+
+from app.core import security
+from app.core.config import CONFIG
+from app.core.etag import etag_matches
+
+router = APIRouter(prefix="/.well-known", tags=["well-known"])
+
+EMPTY_JWKS = b'{"keys":[]}'
+
+
+@router.get("/jwks.json")
+async def jwks(request: Request) -> Response:
+    """Public keys for verifying our tokens locally, selected by the token's kid"""
+    if security.key_ring is None:
+        return Response(EMPTY_JWKS, media_type="application/json")
+
+    document = security.key_ring.jwks()
+    headers = {
+        "Cache-Control": f"public, max-age={CONFIG.JWKS_MAX_AGE_SECONDS}",
+        "ETag": document.etag,
+    }
+    if etag_matches(request.headers.get("if-none-match"), document.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(document.body, media_type="application/json", headers=headers)
@@ -0,0 +1,212 @@
+"""Command line entry point: ``python -m app <command>``."""
+
+import argparse
+import asyncio
+import importlib.util
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+
+async def _read_chunks(path: Path, size: int = 1 << 16) -> AsyncIterator[bytes]:
+    with path.open("rb") as handle:
+        while chunk := handle.read(size):
+            yield chunk
+
+
+async def _import_users(path: Path, fmt: str, batch_size: int | None) -> int:
+    from app.db.connection import AsyncSessionLocal, dispose_engines, init_engines
+    from app.core.security import hashing_pool
+    from app.services.user_import import import_users, iter_lines
+
+    init_engines()
+    try:
+        async with AsyncSessionLocal() as db:
+            lines = iter_lines(_read_chunks(path))
+            report = await import_users(db, lines, fmt, batch_size)
+    finally:
+        hashing_pool.shutdown()
+        await dispose_engines()
+
+    print(report.model_dump_json(indent=2))
+    return 0 if report.failed == 0 else 1
+
+
+def _cmd_import_users(args: argparse.Namespace) -> int:
+    fmt = args.format or ("csv" if args.path.suffix.lower() == ".csv" else "ndjson")
+    return asyncio.run(_import_users(args.path, fmt, args.batch_size))
+
+
+def _cmd_serve(args: argparse.Namespace) -> int:
+    import uvicorn
+
+    from app.core.config import CONFIG
+
+    workers = CONFIG.SERVER_WORKERS if args.workers is None else args.workers
+    workers = workers or os.cpu_count() or 1
+    if CONFIG.HASH_MAX_WORKERS == 0:
+        # Split the CPUs between worker processes instead of giving every
+        # process a hashing pool as large as the whole machine.
+        os.environ["HASH_MAX_WORKERS"] = str(max(1, (os.cpu_count() or 1) // workers))
+
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    print(f"Serving with {workers} worker(s), loop={loop}, http={http}")
+
+    uvicorn.run(
+        "app.main:app",
+        host=args.host or CONFIG.SERVER_HOST,
+        port=args.port or CONFIG.SERVER_PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        lifespan="on",
+        access_log=args.access_log,
+        proxy_headers=True,
+        forwarded_allow_ips=CONFIG.SERVER_FORWARDED_ALLOW_IPS,
+        # On SIGTERM each worker stops accepting connections, waits this long
+        # for in-flight requests, then runs the lifespan shutdown (engine dispose).
+        timeout_graceful_shutdown=CONFIG.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+    )
+    return 0
+
+
+def _cmd_generate_jwt_key(args: argparse.Namespace) -> int:
+    from app.core.keys import add_key_to_manifest
+
+    activate_in = args.activate_in
+    if activate_in is None:
+        # The first key must sign at once; later ones are scheduled ahead so
+        # verifiers can fetch them from the JWKS before they appear in tokens.
+        activate_in = 24.0 if args.manifest.exists() else 0.0
+    not_before = datetime.now(timezone.utc) + timedelta(hours=activate_in)
+    kid = args.kid or f"{args.alg.lower()}-{not_before:%Y%m%d%H%M}"
+    key_path = add_key_to_manifest(args.manifest, kid, args.alg, not_before)
+    print(f"Wrote {key_path}; key {kid!r} signs from {not_before.isoformat()}")
+    return 0
+
+
+def _cmd_calibrate_hash(args: argparse.Namespace) -> int:
+    from app.core.config import CONFIG
+    from app.core.security import calibrate_rounds
+
+    scheme = args.scheme or CONFIG.HASH_SCHEMES[0]
+    rounds = calibrate_rounds(scheme, args.target_ms)
+    print(f"# {scheme}: ~{args.target_ms:g} ms per hash on this machine")
+    print(f"HASH_ROUNDS={rounds}")
+    return 0
+
+
+def parse_importtime(report: str) -> list[tuple[str, int, int]]:
+    """(module, self us, cumulative us) for each line of ``-X importtime`` output."""
+    entries = []
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, module = line.removeprefix("import time:").split("|")
+        entries.append((module.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def _cmd_import_profile(args: argparse.Namespace) -> int:
+    # A fresh interpreter, so nothing is already imported; same as
+    # ``python -X importtime -c "import app.main"``.
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {args.module}"],
+        capture_output=True,
+        text=True,
+        env={"SECRET_KEY": "import-profile", **os.environ},
+    )
+    entries = parse_importtime(result.stderr)
+    if result.returncode != 0 or not entries:
+        print(result.stderr, file=sys.stderr)
+        return 1
+
+    total_us = next(cum for name, _, cum in entries if name == args.module)
+    by_package: dict[str, int] = defaultdict(int)
+    for name, self_us, _ in entries:
+        by_package[name.split(".")[0]] += self_us
+
+    print(f"import {args.module}: {total_us / 1000:.1f} ms, {len(entries)} modules")
+    print(f"\nSlowest top-level packages (self time, top {args.top}):")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[
+        : args.top
+    ]:
+        share = self_us / total_us * 100
+        print(f"  {self_us / 1000:8.1f} ms  {share:5.1f}%  {package}")
+    print(f"\nSlowest modules (cumulative, top {args.top}):")
+    for name, _, cumulative_us in sorted(entries, key=lambda entry: -entry[2])[
+        : args.top
+    ]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser(
+        "import-users", help="Bulk-import users from an NDJSON or CSV file"
+    )
+    import_parser.add_argument("path", type=Path)
+    import_parser.add_argument("--format", choices=["ndjson", "csv"])
+    import_parser.add_argument("--batch-size", type=int)
+    import_parser.set_defaults(handler=_cmd_import_users)
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Run the API with multiple worker processes (production)"
+    )
+    serve_parser.add_argument("--host")
+    serve_parser.add_argument("--port", type=int)
+    serve_parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes (default: SERVER_WORKERS, 1; 0 = one per CPU)",
+    )
+    serve_parser.add_argument("--access-log", action="store_true")
+    serve_parser.set_defaults(handler=_cmd_serve)
+
+    calibrate_parser = subparsers.add_parser(
+        "calibrate-hash", help="Print HASH_ROUNDS for a per-hash time budget"
+    )
+    calibrate_parser.add_argument("--target-ms", type=float, default=250.0)
+    calibrate_parser.add_argument(
+        "--scheme", help="passlib scheme (default: first of HASH_SCHEMES)"
+    )
+    calibrate_parser.set_defaults(handler=_cmd_calibrate_hash)
+
+    key_parser = subparsers.add_parser(
+        "generate-jwt-key", help="Add a new asymmetric signing key to a key manifest"
+    )
+    key_parser.add_argument("manifest", type=Path)
+    key_parser.add_argument(
+        "--alg", choices=["RS256", "ES256", "EdDSA"], default="EdDSA"
+    )
+    key_parser.add_argument("--kid")
+    key_parser.add_argument(
+        "--activate-in",
+        type=float,
+        default=None,
+        help="Hours until the key starts signing (default: 0 for a new manifest, "
+        "else 24, so the JWKS publishes it first)",
+    )
+    key_parser.set_defaults(handler=_cmd_generate_jwt_key)
+
+    profile_parser = subparsers.add_parser(
+        "import-profile", help="Report where import (cold start) time goes"
+    )
+    profile_parser.add_argument("--module", default="app.main")
+    profile_parser.add_argument("--top", type=int, default=15)
+    profile_parser.set_defaults(handler=_cmd_import_profile)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
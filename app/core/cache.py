@@ -0,0 +1,84 @@
+from collections import OrderedDict
+from time import monotonic
+
+from app.core import metrics
+
+CACHE_REQUESTS = metrics.counter(
+    "astra_cache_requests_total",
+    "In-process cache lookups by cache name and result",
+    labelnames=("cache", "result"),
+)
+
+
+class TTLCache[K, V]:
+    """Bounded LRU mapping whose entries expire after a time-to-live.
+
+    Entries default to the cache-wide ``ttl`` but may be stored with a shorter
+    one, e.g. to stop serving a value once the token it came from expires.
+    A ``maxsize`` of 0 disables the cache entirely.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, name: str = ""):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > monotonic()
+
+    def _record(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        if self.name:
+            CACHE_REQUESTS.inc(cache=self.name, result="hit" if hit else "miss")
+
+    def get(self, key: K) -> V | None:
+        entry = self._data.get(key)
+        if entry is None:
+            self._record(False)
+            return None
+        expires_at, value = entry
+        if expires_at <= monotonic():
+            del self._data[key]
+            self._record(False)
+            return None
+        self._data.move_to_end(key)
+        self._record(True)
+        return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        if self.maxsize <= 0:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        self._data[key] = (monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        entry = self._data.pop(key, None)
+        return entry[1] if entry is not None else None
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
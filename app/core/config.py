@@ -1,5 +1,7 @@
+from pydantic import AwareDatetime
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
+from typing import Literal
 
 BASE_DIR = Path(__file__).resolve().parents[2]
 
@@ -14,9 +16,116 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 10080  # 7 days
 
+    # Asymmetric signing (RS256/ES256/EdDSA); see app.core.keys for the format
+    JWT_KEYS_FILE: str = ""  # key manifest; empty keeps SECRET_KEY/ALGORITHM
+    # With a key manifest, kid-less SECRET_KEY tokens are rejected unless this
+    # (ISO 8601 with offset) is still in the future
+    ALLOW_LEGACY_HS256_TOKENS_UNTIL: AwareDatetime | None = None
+    JWKS_MAX_AGE_SECONDS: int = 300
+
+    # Refresh token rotation / revocation
+    REVOCATION_BACKEND: Literal["postgres", "memory"] = "postgres"
+    REVOCATION_LOCAL_CACHE_SIZE: int = 100000
+    REVOCATION_PRUNE_INTERVAL_SECONDS: int = 3600
+
+    # Token version map: lets access checks authorize from token claims alone
+    TOKEN_VERSION_POLL_INTERVAL_SECONDS: float = 2.0  # 0 disables the map
+    TOKEN_VERSION_CACHE_SIZE: int = 100000  # users remembered per worker (LRU)
+    TOKEN_VERSION_CACHE_TTL_SECONDS: float = 300.0  # re-read from the DB after this
+
+    # Soft-deleted accounts are hard-deleted by a background worker in batches
+    USER_PURGE_INTERVAL_SECONDS: float = 300.0  # 0 disables the worker
+    USER_PURGE_DELAY_SECONDS: float = 0.0  # keep deleted rows at least this long
+    USER_PURGE_BATCH_SIZE: int = 500
+    USER_PURGE_BATCH_PAUSE_SECONDS: float = 0.5  # between batches, to spare the DB
+
+    # Login rate limiting (sliding window, checked before any password hashing)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: Literal["memory", "redis"] = "memory"
+    RATE_LIMIT_REDIS_URL: str = "redis://localhost:6379/0"
+    RATE_LIMIT_MAX_KEYS: int = 100000  # memory backend only
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: float = 60.0
+    LOGIN_RATE_LIMIT_PER_IP: int = 20  # 0 disables a limit
+    LOGIN_RATE_LIMIT_PER_USERNAME: int = 10
+    LOGIN_RATE_LIMIT_GLOBAL: int = 1000
+
+    # Production server (python -m app serve)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    # 0 = one worker process per CPU; /metrics and /readyz are per process, so
+    # the default of 1 scales out with replicas that can be scraped one by one
+    SERVER_WORKERS: int = 1
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = 30
+    # Proxies whose X-Forwarded-For is trusted for the client IP (comma-separated
+    # addresses/CIDRs, or "*"); others are seen as the client, so everyone behind
+    # an untrusted proxy shares one per-IP login rate limit
+    SERVER_FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+
+    # Per-stage request timing (Server-Timing header + /metrics histograms)
+    TIMING_ENABLED: bool = False
+
+    # Password hashing: the first scheme hashes, the others are only verified
+    # and upgraded on the next successful login (as are hashes with other rounds)
+    HASH_SCHEMES: list[str] = ["pbkdf2_sha256"]
+    HASH_ROUNDS: int = 0  # 0 = passlib's default; see `python -m app calibrate-hash`
+
+    # Password hashing worker pool
+    HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    HASH_MAX_WORKERS: int = 0  # 0 = one worker per CPU
+    HASH_MAX_QUEUE: int = 64
+
+    # Logins for unknown usernames: negative cache + latency-matched dummy path
+    UNKNOWN_USER_CACHE_MAX_SIZE: int = 100000
+    # Other workers clear a registered name on their next token version poll;
+    # this TTL bounds staleness only when that poll is disabled
+    UNKNOWN_USER_CACHE_TTL_SECONDS: float = 10.0
+    AUTH_LATENCY_SAMPLES: int = 512
+
+    # Bulk user import
+    BULK_IMPORT_BATCH_SIZE: int = 500
+    BULK_IMPORT_HASH_CONCURRENCY: int = 0  # 0 = half of the hashing workers
+    BULK_IMPORT_MAX_ERRORS: int = 1000  # rows reported individually per import
+    BULK_IMPORT_HASH_MAX_WAIT_SECONDS: float = 30.0  # per password, pool saturated
+    BULK_IMPORT_MAX_LINE_LENGTH: int = 65536  # characters; longer records fail
+
+    # Authenticated principal cache used by get_current_principal
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000  # 0 disables the cache
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+
+    # Verified JWT payload cache used by _verify_token
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: float = 300.0  # upper bound; entries never outlive 'exp'
+
     POSTGRES_USER: str = ""
     POSTGRES_PASSWORD: str = ""
     POSTGRES_DB: str = ""
+    POSTGRES_HOST: str = "db"
+    POSTGRES_PORT: int = 5432
+
+    # Engine and connection pool
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800  # seconds, -1 disables
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100  # prepared statements per connection, 0 disables
+    DB_COMPILED_CACHE_SIZE: int = 500  # SQLAlchemy compiled SQL cache per engine
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # server-side statement_timeout, 0 disables
+    DB_WARMUP_CONNECTIONS: int = 2  # opened before /readyz reports ready
+    WARM_UP_RETRY_SECONDS: float = 1.0  # pause between failed warm-up attempts
+
+    # /readyz serves the result of a background database check run this often
+    HEALTH_CHECK_INTERVAL_SECONDS: float = 5.0
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 2.0
+
+    # Optional read replica for read-only routes; same credentials and database
+    POSTGRES_REPLICA_HOST: str = ""  # empty sends every read to the primary
+    POSTGRES_REPLICA_PORT: int = 5432
+    DB_REPLICA_CONNECT_TIMEOUT: float = 2.0
+    DB_REPLICA_RETRY_SECONDS: float = 30.0  # primary-only reads after a failure
+    READ_YOUR_WRITES_SECONDS: int = 10  # a client's reads stay on the primary
 
     # Testing configuration
     POSTGRES_TEST_USER: str = ""
@@ -0,0 +1,21 @@
+from datetime import datetime
+
+
+def user_etag(user_id: int, updated_at: datetime) -> str:
+    """Strong ETag for a user representation; changes whenever the row does."""
+    return f'"{user_id}-{int(updated_at.timestamp() * 1_000_000):x}"'
+
+
+def etag_matches(header: str | None, etag: str, weak: bool = True) -> bool:
+    """Whether an If-None-Match (``weak``) or If-Match header lists ``etag``."""
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if weak and candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
@@ -47,3 +47,45 @@ class InvalidPasswordConfirmationError(AuthenticationError):
 
 class InvalidConfirmationTextError(AuthenticationError):
     default_message = "Confirmation text must be 'DELETE MY ACCOUNT'"
+
+
+# Capacity related exceptions
+class ServiceOverloadedError(Exception):
+    """Base exception for requests shed because a resource is saturated."""
+
+    default_message = "Service is temporarily overloaded, please retry later"
+
+    def __init__(self, message: str | None = None, retry_after: int = 1):
+        self.message = message or self.default_message
+        self.retry_after = retry_after
+        super().__init__(self.message)
+
+
+class HashingPoolSaturatedError(ServiceOverloadedError):
+    default_message = "Too many concurrent password operations, please retry later"
+
+
+class RateLimitExceededError(Exception):
+    default_message = "Too many requests, please retry later"
+
+    def __init__(self, message: str | None = None, retry_after: int = 1):
+        self.message = message or self.default_message
+        self.retry_after = retry_after
+        super().__init__(self.message)
+
+
+# Request related exceptions
+class InvalidCursorError(Exception):
+    default_message = "Invalid pagination cursor"
+
+    def __init__(self, message: str | None = None):
+        self.message = message or self.default_message
+        super().__init__(self.message)
+
+
+class PreconditionFailedError(Exception):
+    default_message = "Resource has been modified since it was retrieved"
+
+    def __init__(self, message: str | None = None):
+        self.message = message or self.default_message
+        super().__init__(self.message)
@@ -36,3 +36,29 @@ async def invalid_password_confirmation_handler(request: Request, exc: Exception
 
 async def invalid_confirmation_text_handler(request: Request, exc: Exception):
     return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+async def service_overloaded_handler(request: Request, exc: Exception):
+    retry_after = getattr(exc, "retry_after", 1)
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+async def rate_limit_exceeded_handler(request: Request, exc: Exception):
+    retry_after = getattr(exc, "retry_after", 1)
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+async def invalid_cursor_handler(request: Request, exc: Exception):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+async def precondition_failed_handler(request: Request, exc: Exception):
+    return JSONResponse(status_code=412, content={"detail": str(exc)})
@@ -0,0 +1,99 @@
+import asyncio
+import os
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import suppress
+from time import perf_counter
+from typing import Any
+
+from app.core import metrics
+from app.core.exceptions import HashingPoolSaturatedError
+
+HASH_DURATION = metrics.histogram(
+    "astra_password_hash_seconds",
+    "Wall-clock duration of password hash operations, including queueing",
+    labelnames=("operation",),
+)
+HASH_REJECTED = metrics.counter(
+    "astra_password_hash_rejected_total",
+    "Password hash operations rejected because the worker pool was saturated",
+    labelnames=("operation",),
+)
+HASH_IN_FLIGHT = metrics.gauge(
+    "astra_password_hash_in_flight",
+    "Password hash operations currently running or queued",
+)
+
+
+class HashingPool:
+    """Bounded executor that keeps CPU-heavy password hashing off the event loop.
+
+    At most ``max_workers + max_queue`` operations may be admitted at once; any
+    further call fails fast with ``HashingPoolSaturatedError`` instead of piling
+    up behind the pool.
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: int = 0, max_queue: int = 64):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown hashing executor kind: {kind!r}")
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.capacity = self.max_workers + max_queue
+        self._executor: Executor | None = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def export_metrics(self) -> None:
+        HASH_IN_FLIGHT.set_callback(lambda: self._pending)
+
+    def _get_executor(self) -> Executor:
+        # Created lazily so importing the app never forks or spawns threads.
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="pwd-hash"
+                )
+        return self._executor
+
+    def ensure_capacity(self, operation: str) -> None:
+        """Raise ``HashingPoolSaturatedError`` exactly when ``run`` would."""
+        if self._pending >= self.capacity:
+            HASH_REJECTED.inc(operation=operation)
+            raise HashingPoolSaturatedError()
+
+    async def run(self, operation: str, fn: Callable[..., Any], *args: Any) -> Any:
+        self.ensure_capacity(operation)
+
+        self._pending += 1
+        start = perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            job = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._pending -= 1
+            raise
+
+        def release() -> None:
+            self._pending -= 1
+            HASH_DURATION.observe(perf_counter() - start, operation=operation)
+
+        def on_done(_job) -> None:
+            # Runs when the job finishes (or is cancelled before starting), not
+            # when the awaiting request is cancelled: a job already running
+            # keeps its worker busy and must keep counting against capacity.
+            with suppress(RuntimeError):  # loop already closed at shutdown
+                loop.call_soon_threadsafe(release)
+
+        job.add_done_callback(on_done)
+        return await asyncio.wrap_future(job)
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
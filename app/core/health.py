@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+from time import time
+
+from app.core.config import CONFIG
+
+
+@dataclass(frozen=True, slots=True)
+class DatabaseCheck:
+    ok: bool
+    latency_seconds: float
+    checked_at: float  # unix time
+    error: str | None = None
+
+
+class Readiness:
+    """State behind ``/readyz``, kept current by background tasks.
+
+    Probes only read this snapshot, so they never touch the database or the
+    connection pool themselves. The app is ready once startup warm-up has
+    finished and the latest database check passed and is not older than
+    ``stale_after`` seconds (a stuck checker must not report ready forever).
+    While warm-up keeps failing, ``warm_up_error`` says why.
+    Pool saturation is reported but never makes the app unready: a load spike
+    would otherwise pull every instance out of rotation at once.
+    """
+
+    def __init__(self, stale_after: float):
+        self.stale_after = stale_after
+        self.warmed_up = False
+        self.warm_up_seconds: float | None = None
+        self.warm_up_error: str | None = None
+        self.database: DatabaseCheck | None = None
+
+    def mark_warmed_up(self, seconds: float) -> None:
+        self.warmed_up = True
+        self.warm_up_seconds = seconds
+        self.warm_up_error = None
+
+    def record_warm_up_error(self, error: str) -> None:
+        self.warm_up_error = error
+
+    def record_database(
+        self, ok: bool, latency_seconds: float, error: str | None = None
+    ) -> None:
+        self.database = DatabaseCheck(ok, latency_seconds, time(), error)
+
+    def database_ok(self) -> bool:
+        check = self.database
+        return (
+            check is not None
+            and check.ok
+            and time() - check.checked_at <= self.stale_after
+        )
+
+    @property
+    def ready(self) -> bool:
+        return self.warmed_up and self.database_ok()
+
+    def reset(self) -> None:
+        self.warmed_up = False
+        self.warm_up_seconds = None
+        self.warm_up_error = None
+        self.database = None
+
+
+# Three missed checks in a row count as a failed one.
+readiness = Readiness(stale_after=3 * CONFIG.HEALTH_CHECK_INTERVAL_SECONDS)
@@ -0,0 +1,197 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from jwt.algorithms import get_default_algorithms
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "RS384", "RS512", "ES256", "ES384", "EdDSA")
+
+
+@dataclass(frozen=True, slots=True)
+class SigningKey:
+    kid: str
+    alg: str
+    private_key: object
+    public_key: object
+    not_before: datetime
+    not_after: datetime | None = None
+
+    def verifies_at(self, now: datetime) -> bool:
+        return self.not_after is None or now < self.not_after
+
+    def signs_at(self, now: datetime) -> bool:
+        return self.not_before <= now and self.verifies_at(now)
+
+    def to_jwk(self) -> dict:
+        jwk = get_default_algorithms()[self.alg].to_jwk(self.public_key, as_dict=True)
+        return {**jwk, "kid": self.kid, "alg": self.alg, "use": "sig"}
+
+
+@dataclass(frozen=True, slots=True)
+class JWKSDocument:
+    body: bytes
+    etag: str
+
+
+class KeyRing:
+    """Asymmetric JWT keys parsed once at startup and selected by ``kid``.
+
+    Rotation is scheduled through ``not_before``: a key is published in the
+    JWKS (and accepted for verification) as soon as it is loaded, but only
+    signs new tokens from ``not_before`` on, so verifiers can pick it up
+    before the first token using it appears. The newest active key signs.
+    A key stops verifying and is unpublished at ``not_after``; set it no
+    earlier than its successor's ``not_before`` plus the refresh token lifetime.
+    """
+
+    def __init__(self, keys: list[SigningKey]):
+        if not keys:
+            raise ValueError("Key ring needs at least one key")
+        self._keys = {key.kid: key for key in keys}
+        if len(self._keys) != len(keys):
+            raise ValueError("Duplicate kid in key ring")
+        self._by_not_before = sorted(keys, key=lambda key: key.not_before, reverse=True)
+        self._jwks: tuple[tuple[str, ...], JWKSDocument] | None = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def signing_key(self, now: datetime | None = None) -> SigningKey:
+        now = now or datetime.now(timezone.utc)
+        for key in self._by_not_before:
+            if key.signs_at(now):
+                return key
+        raise LookupError("No signing key is active")
+
+    def verification_key(self, kid: str, now: datetime | None = None) -> SigningKey:
+        key = self._keys.get(kid)
+        if key is None or not key.verifies_at(now or datetime.now(timezone.utc)):
+            raise LookupError(f"Unknown or retired key id: {kid!r}")
+        return key
+
+    def jwks(self, now: datetime | None = None) -> JWKSDocument:
+        """Serialized JWKS of the published keys, rebuilt only when that set changes."""
+        now = now or datetime.now(timezone.utc)
+        published = tuple(
+            key.kid for key in self._by_not_before if key.verifies_at(now)
+        )
+        if self._jwks is None or self._jwks[0] != published:
+            body = json.dumps(
+                {"keys": [self._keys[kid].to_jwk() for kid in published]},
+                separators=(",", ":"),
+            ).encode()
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            self._jwks = (published, JWKSDocument(body=body, etag=etag))
+        return self._jwks[1]
+
+
+def _parse_timestamp(value: str | None) -> datetime | None:
+    if value is None:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def load_key_ring(manifest_path: str | Path) -> KeyRing:
+    """Load keys from a JSON manifest.
+
+    The manifest looks like::
+
+        {"keys": [{"kid": "2026-10", "alg": "EdDSA",
+                   "private_key_file": "2026-10.pem",
+                   "not_before": "2026-10-01T00:00:00Z", "not_after": null}]}
+
+    ``private_key_file`` is resolved relative to the manifest. Raises
+    ValueError when no key can sign yet, so a manifest holding only future
+    keys fails at startup instead of on every login.
+    """
+    # Imported lazily: only deployments using asymmetric keys need cryptography.
+    from cryptography.hazmat.primitives.serialization import load_pem_private_key
+
+    manifest_path = Path(manifest_path)
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    keys = []
+    for entry in manifest["keys"]:
+        alg = entry["alg"]
+        if alg not in ASYMMETRIC_ALGORITHMS:
+            raise ValueError(f"Unsupported signing algorithm for {entry['kid']}: {alg}")
+        pem = (manifest_path.parent / entry["private_key_file"]).read_bytes()
+        private_key = load_pem_private_key(pem, password=None)
+        keys.append(
+            SigningKey(
+                kid=entry["kid"],
+                alg=alg,
+                private_key=private_key,
+                public_key=private_key.public_key(),
+                not_before=_parse_timestamp(entry.get("not_before"))
+                or datetime.fromtimestamp(0, timezone.utc),
+                not_after=_parse_timestamp(entry.get("not_after")),
+            )
+        )
+    ring = KeyRing(keys)
+    try:
+        ring.signing_key()
+    except LookupError:
+        raise ValueError(
+            f"No key in {manifest_path} can sign tokens yet; add one whose "
+            "not_before has passed (generate-jwt-key --activate-in 0)"
+        ) from None
+    return ring
+
+
+def _generate_private_key(alg: str):
+    from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+    if alg.startswith("RS"):
+        return rsa.generate_private_key(public_exponent=65537, key_size=3072)
+    if alg == "ES256":
+        return ec.generate_private_key(ec.SECP256R1())
+    if alg == "ES384":
+        return ec.generate_private_key(ec.SECP384R1())
+    return ed25519.Ed25519PrivateKey.generate()
+
+
+def add_key_to_manifest(
+    manifest_path: str | Path, kid: str, alg: str, not_before: datetime
+) -> Path:
+    """Generate a new private key next to the manifest and schedule it.
+
+    Creates the manifest if needed; returns the path of the written PEM file.
+    """
+    from cryptography.hazmat.primitives import serialization
+
+    if alg not in ASYMMETRIC_ALGORITHMS:
+        raise ValueError(f"Unsupported signing algorithm: {alg}")
+    manifest_path = Path(manifest_path)
+    manifest = (
+        json.loads(manifest_path.read_text(encoding="utf-8"))
+        if manifest_path.exists()
+        else {"keys": []}
+    )
+    if any(entry["kid"] == kid for entry in manifest["keys"]):
+        raise ValueError(f"Key id already in manifest: {kid!r}")
+
+    pem = _generate_private_key(alg).private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    key_path = manifest_path.parent / f"{kid}.pem"
+    key_path.write_bytes(pem)
+    key_path.chmod(0o600)
+
+    manifest["keys"].append(
+        {
+            "kid": kid,
+            "alg": alg,
+            "private_key_file": key_path.name,
+            "not_before": not_before.isoformat(),
+            "not_after": None,
+        }
+    )
+    manifest_path.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    return key_path
@@ -0,0 +1,20 @@
+import base64
+import json
+from datetime import datetime
+
+from app.core.exceptions import InvalidCursorError
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Opaque keyset cursor pointing just past the row (created_at, id)."""
+    raw = json.dumps({"c": created_at.isoformat(), "i": id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(data["c"]), int(data["i"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursorError() from exc
@@ -0,0 +1,174 @@
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import time
+from typing import Protocol
+
+from app.core import metrics
+from app.core.config import CONFIG
+from app.core.exceptions import RateLimitExceededError
+
+RATE_LIMITED = metrics.counter(
+    "astra_rate_limited_total",
+    "Requests rejected by a rate limit, by limit name",
+    labelnames=("limit",),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Limit:
+    name: str
+    max_requests: int
+    window: float
+
+
+def _retry_after(previous: int, current: int, elapsed: float, limit: Limit) -> float:
+    """Seconds until one more request fits under the sliding-window estimate.
+
+    The estimate is ``previous * (1 - elapsed / window) + current``; ``previous``
+    decays linearly while ``current`` stays until the window rolls over.
+    """
+    window, allowed = limit.window, limit.max_requests - 1
+    if current <= allowed:
+        # Wait for the previous window's weight to decay enough.
+        if previous == 0:
+            return 0.0
+        needed = window * (1 - (allowed - current) / previous)
+        return max(needed - elapsed, 0.0)
+    # The current window alone is full: it becomes "previous" after rollover.
+    needed = window * (1 - allowed / current) if current else 0.0
+    return window - elapsed + needed
+
+
+class RateLimitBackend(Protocol):
+    """Shared counter storage for ``RateLimiter``.
+
+    ``hit`` records a request against ``key`` unless that would exceed
+    ``limit``; it returns None when accepted, otherwise the seconds to wait.
+    """
+
+    async def hit(self, key: str, limit: Limit) -> float | None: ...
+
+    async def reset(self) -> None: ...
+
+
+class MemoryRateLimitBackend:
+    """Process-local sliding-window counters; three numbers per tracked key.
+
+    At most ``max_keys`` keys are tracked; the least recently used key is
+    forgotten first, which at worst lets an idle client start afresh.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        # key -> (window index, previous window count, current window count)
+        self._counters: OrderedDict[str, tuple[int, int, int]] = OrderedDict()
+
+    async def hit(self, key: str, limit: Limit) -> float | None:
+        now = time()
+        index, elapsed = divmod(now, limit.window)
+        index = int(index)
+
+        window_index, previous, current = self._counters.get(key, (index, 0, 0))
+        if window_index != index:
+            previous = current if window_index == index - 1 else 0
+            current = 0
+
+        estimate = previous * (1 - elapsed / limit.window) + current
+        if estimate + 1 > limit.max_requests:
+            self._store(key, (index, previous, current))
+            return _retry_after(previous, current, elapsed, limit)
+
+        self._store(key, (index, previous, current + 1))
+        return None
+
+    def _store(self, key: str, counters: tuple[int, int, int]) -> None:
+        self._counters[key] = counters
+        self._counters.move_to_end(key)
+        while len(self._counters) > self.max_keys:
+            self._counters.popitem(last=False)
+
+    async def reset(self) -> None:
+        self._counters.clear()
+
+
+class RedisRateLimitBackend:
+    """Sliding-window counters in Redis, shared by every worker and replica.
+
+    Needs only ``get``, ``incr``, ``decr`` and ``expire`` from the client, so any
+    ``redis.asyncio``-compatible client works. One counter key per window,
+    expired once it can no longer be the previous window.
+    """
+
+    def __init__(self, client, prefix: str = "astra:ratelimit"):
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, key: str, index: int) -> str:
+        return f"{self.prefix}:{key}:{index}"
+
+    async def hit(self, key: str, limit: Limit) -> float | None:
+        now = time()
+        index, elapsed = divmod(now, limit.window)
+        index = int(index)
+
+        # Increment first so concurrent workers never both take the last slot.
+        counter_key = self._key(key, index)
+        current = await self.client.incr(counter_key)
+        if current == 1:
+            await self.client.expire(counter_key, math.ceil(limit.window * 2))
+        previous = int(await self.client.get(self._key(key, index - 1)) or 0)
+
+        estimate = previous * (1 - elapsed / limit.window) + current
+        if estimate > limit.max_requests:
+            await self.client.decr(counter_key)
+            return _retry_after(previous, current - 1, elapsed, limit)
+        return None
+
+    async def reset(self) -> None:
+        # Counters expire on their own; nothing process-local to drop.
+        return None
+
+
+class RateLimiter:
+    def __init__(self, backend: RateLimitBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+
+    async def check(self, limit: Limit, key: str = "") -> None:
+        """Count one request against ``limit`` or raise RateLimitExceededError."""
+        if not self.enabled or limit.max_requests <= 0:
+            return
+        retry_after = await self.backend.hit(f"{limit.name}:{key}", limit)
+        if retry_after is not None:
+            RATE_LIMITED.inc(limit=limit.name)
+            raise RateLimitExceededError(retry_after=max(1, math.ceil(retry_after)))
+
+
+LOGIN_PER_IP = Limit(
+    "login_ip", CONFIG.LOGIN_RATE_LIMIT_PER_IP, CONFIG.LOGIN_RATE_LIMIT_WINDOW_SECONDS
+)
+LOGIN_PER_USERNAME = Limit(
+    "login_user",
+    CONFIG.LOGIN_RATE_LIMIT_PER_USERNAME,
+    CONFIG.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+)
+LOGIN_GLOBAL = Limit(
+    "login_global",
+    CONFIG.LOGIN_RATE_LIMIT_GLOBAL,
+    CONFIG.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+)
+
+
+def build_rate_limiter() -> RateLimiter:
+    if CONFIG.RATE_LIMIT_BACKEND == "redis":
+        # Optional dependency, only needed when limits are shared via Redis.
+        from redis.asyncio import Redis
+
+        backend = RedisRateLimitBackend(Redis.from_url(CONFIG.RATE_LIMIT_REDIS_URL))
+    else:
+        backend = MemoryRateLimitBackend(max_keys=CONFIG.RATE_LIMIT_MAX_KEYS)
+    return RateLimiter(backend, enabled=CONFIG.RATE_LIMIT_ENABLED)
+
+
+rate_limiter = build_rate_limiter()
@@ -0,0 +1,51 @@
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up; the stdlib encoder is the fallback.
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when installed, compact stdlib JSON otherwise.
+
+    Returned directly from an endpoint it also skips FastAPI's
+    ``jsonable_encoder`` pass, so content must already be JSON-serializable
+    (str-based enums such as ``UserRole`` are).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class ModelResponse(Response):
+    """Serialize a pydantic model straight to JSON bytes with its compiled
+    serializer, skipping the intermediate dict FastAPI would build."""
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: BaseModel,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+        background: BackgroundTask | None = None,
+    ):
+        super().__init__(content, status_code, headers, background=background)
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.__pydantic_serializer__.to_json(content)
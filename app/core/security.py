@@ -1,10 +1,55 @@
+import asyncio
+import hashlib
+import math
+import random
+import secrets
+import time
+import uuid
+from collections import deque
 from datetime import datetime, timedelta, timezone
 from passlib.context import CryptContext
+from passlib.registry import get_crypt_handler
 import jwt
+from app.core.cache import TTLCache
 from app.core.config import CONFIG
-from app.core.exceptions import InvalidTokenError, TokenExpiredError
+from app.core.exceptions import (
+    HashingPoolSaturatedError,
+    InvalidTokenError,
+    TokenExpiredError,
+)
+from app.core.hashing import HashingPool
+from app.core.keys import KeyRing, load_key_ring
+from app.core.timing import timed
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+
+def build_crypt_context(schemes: list[str], rounds: int = 0) -> CryptContext:
+    """Hash with ``schemes[0]`` at ``rounds``; every other scheme or rounds
+    value still verifies but is reported by ``needs_update``."""
+    settings = {f"{schemes[0]}__rounds": rounds} if rounds else {}
+    return CryptContext(schemes=schemes, deprecated="auto", **settings)
+
+
+pwd_context = build_crypt_context(CONFIG.HASH_SCHEMES, CONFIG.HASH_ROUNDS)
+
+hashing_pool = HashingPool(
+    kind=CONFIG.HASH_EXECUTOR,
+    max_workers=CONFIG.HASH_MAX_WORKERS,
+    max_queue=CONFIG.HASH_MAX_QUEUE,
+)
+hashing_pool.export_metrics()
+
+# Asymmetric signing keys; None keeps the symmetric SECRET_KEY/ALGORITHM setup.
+key_ring: KeyRing | None = (
+    load_key_ring(CONFIG.JWT_KEYS_FILE) if CONFIG.JWT_KEYS_FILE else None
+)
+
+# Keyed by (token type, sha256 of the raw token); values are the signing key id
+# (None for symmetric tokens) and the validated payload.
+token_cache: TTLCache[tuple[str, bytes], tuple[str | None, dict]] = TTLCache(
+    maxsize=CONFIG.TOKEN_CACHE_MAX_SIZE,
+    ttl=CONFIG.TOKEN_CACHE_TTL_SECONDS,
+    name="token",
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -15,6 +60,118 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    return pwd_context.needs_update(hashed_password)
+
+
+def calibrate_rounds(scheme: str, target_ms: float, samples: int = 5) -> int:
+    """Rounds for ``scheme`` that make one hash take about ``target_ms`` here."""
+    handler = get_crypt_handler(scheme)
+    base_rounds = handler.default_rounds
+    hasher = handler.using(rounds=base_rounds)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash("calibration-password")
+        timings.append(time.perf_counter() - start)
+    elapsed_ms = sorted(timings)[len(timings) // 2] * 1000
+
+    if handler.rounds_cost == "log2":
+        rounds = base_rounds + round(math.log2(target_ms / elapsed_ms))
+    else:
+        rounds = round(base_rounds * target_ms / elapsed_ms)
+    return max(handler.min_rounds, min(rounds, handler.max_rounds))
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    with timed("hash"):
+        return await hashing_pool.run(
+            "verify", verify_password, plain_password, hashed_password
+        )
+
+
+async def hash_password_async(password: str) -> str:
+    with timed("hash"):
+        return await hashing_pool.run("hash", get_password_hash, password)
+
+
+class LatencySampler:
+    """Recent end-to-end durations of real credential checks."""
+
+    def __init__(self, size: int):
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def sample(self) -> float:
+        return random.choice(self._samples)
+
+    def clear(self) -> None:
+        self._samples.clear()
+
+
+# Samples needed before unknown usernames are answered by sleeping alone.
+MIN_LATENCY_SAMPLES = 16
+
+auth_latency = LatencySampler(CONFIG.AUTH_LATENCY_SAMPLES)
+_dummy_hash: str | None = None
+
+
+async def dummy_verify_async(started: float) -> None:
+    """Take as long as a real credential check begun at ``started`` would.
+
+    Once calibrated, this sleeps for a duration drawn from recent real checks,
+    so unknown usernames match known ones in latency while costing no CPU,
+    and it is rejected like a real check while the hashing pool is saturated.
+    Until then it verifies against a dummy hash made with the configured
+    scheme and rounds, and records that as a sample.
+    """
+    global _dummy_hash
+    if len(auth_latency) < MIN_LATENCY_SAMPLES:
+        if _dummy_hash is None:
+            _dummy_hash = await hash_password_async(secrets.token_urlsafe(16))
+        await verify_password_async(secrets.token_urlsafe(16), _dummy_hash)
+        auth_latency.record(time.perf_counter() - started)
+        return
+    # A known username would be shed here with a 503 when the pool is full;
+    # answering 401 instead would reveal that this one does not exist.
+    hashing_pool.ensure_capacity("verify")
+    delay = auth_latency.sample() - (time.perf_counter() - started)
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+
+async def hash_passwords_async(
+    passwords: list[str], concurrency: int | None = None, max_wait: float = 0.0
+) -> list[str]:
+    """Hash many passwords in parallel while holding at most ``concurrency``
+    pool slots, so bulk work leaves room for interactive logins.
+
+    While the pool is saturated each password is retried with backoff for up
+    to ``max_wait`` seconds before HashingPoolSaturatedError is raised.
+    """
+    limit = asyncio.Semaphore(concurrency or max(1, hashing_pool.max_workers // 2))
+
+    async def _hash(password: str) -> str:
+        async with limit:
+            deadline = time.monotonic() + max_wait
+            delay = 0.05
+            while True:
+                try:
+                    return await hash_password_async(password)
+                except HashingPoolSaturatedError:
+                    if time.monotonic() + delay > deadline:
+                        raise
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, 1.0)
+
+    return await asyncio.gather(*(_hash(password) for password in passwords))
+
+
 def _create_token(
     data: dict, expires_delta: timedelta | None, token_type: str, default_minutes: int
 ) -> str:
@@ -23,12 +180,45 @@ def _create_token(
         expires_delta or timedelta(minutes=default_minutes)
     )
     to_encode.update({"exp": expire, "type": token_type})
+    if key_ring is not None:
+        key = key_ring.signing_key()
+        return jwt.encode(
+            to_encode, key.private_key, algorithm=key.alg, headers={"kid": key.kid}
+        )
     return jwt.encode(to_encode, CONFIG.SECRET_KEY, algorithm=CONFIG.ALGORITHM)
 
 
-def _verify_token(token: str, expected_type: str) -> dict:
+def _check_key_id(kid: str | None) -> None:
+    """Reject a token whose signing key the key ring no longer accepts.
+
+    Kid-less tokens were signed with SECRET_KEY before the switch to a key
+    ring; they are only honoured until ALLOW_LEGACY_HS256_TOKENS_UNTIL.
+    """
+    if kid is None:
+        until = CONFIG.ALLOW_LEGACY_HS256_TOKENS_UNTIL
+        if until is None or datetime.now(timezone.utc) >= until:
+            raise InvalidTokenError("Token has no key id")
+        return
+    try:
+        key_ring.verification_key(kid)
+    except LookupError:
+        raise InvalidTokenError("Unknown signing key")
+
+
+def _decode_signed(token: str) -> dict:
+    kid = jwt.get_unverified_header(token).get("kid")
+    if key_ring is not None:
+        _check_key_id(kid)
+    if kid is None or key_ring is None:
+        # Symmetric tokens, or legacy ones still inside their grace window.
+        return jwt.decode(token, CONFIG.SECRET_KEY, algorithms=[CONFIG.ALGORITHM])
+    key = key_ring.verification_key(kid)
+    return jwt.decode(token, key.public_key, algorithms=[key.alg])
+
+
+def _decode_token(token: str, expected_type: str) -> dict:
     try:
-        payload = jwt.decode(token, CONFIG.SECRET_KEY, algorithms=[CONFIG.ALGORITHM])
+        payload = _decode_signed(token)
         if "sub" not in payload:
             raise InvalidTokenError("Token missing 'sub' claim")
         if payload.get("type") != expected_type:
@@ -40,6 +230,33 @@ def _verify_token(token: str, expected_type: str) -> dict:
         raise InvalidTokenError()
 
 
+def _verify_token(token: str, expected_type: str) -> dict:
+    with timed("jwt"):
+        if not CONFIG.TOKEN_CACHE_ENABLED:
+            return _decode_token(token, expected_type)
+
+        key = (expected_type, hashlib.sha256(token.encode()).digest())
+        cached = token_cache.get(key)
+        if cached is not None:
+            kid, payload = cached
+            if payload["exp"] > time.time():
+                # The signing key may have been retired since the token was cached.
+                if key_ring is not None:
+                    try:
+                        _check_key_id(kid)
+                    except InvalidTokenError:
+                        token_cache.pop(key)
+                        raise
+                return dict(payload)
+
+        payload = _decode_token(token, expected_type)
+        expires_at = payload.get("exp")
+        if expires_at is not None:
+            kid = jwt.get_unverified_header(token).get("kid")
+            token_cache.set(key, (kid, payload), ttl=expires_at - time.time())
+        return dict(payload)
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     return _create_token(
         data, expires_delta, "access", CONFIG.ACCESS_TOKEN_EXPIRE_MINUTES
@@ -51,10 +268,23 @@ def verify_access_token(token: str) -> dict:
 
 
 def create_refresh_token(data: dict, expires_delta: timedelta | None = None) -> str:
+    # Every refresh token gets a unique id so it can be consumed exactly once.
     return _create_token(
-        data, expires_delta, "refresh", CONFIG.REFRESH_TOKEN_EXPIRE_MINUTES
+        {**data, "jti": uuid.uuid4().hex},
+        expires_delta,
+        "refresh",
+        CONFIG.REFRESH_TOKEN_EXPIRE_MINUTES,
     )
 
 
 def verify_refresh_token(token: str) -> dict:
     return _verify_token(token, "refresh")
+
+
+async def warm_up() -> None:
+    """Load the hash backend and a hashing worker, and exercise JWT sign/verify.
+
+    Run at startup so the first real login does not pay for either.
+    """
+    await hash_password_async("Warm-up-password-1")
+    _decode_token(create_access_token({"sub": "warm-up"}), "access")
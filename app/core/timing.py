@@ -0,0 +1,87 @@
+from contextvars import ContextVar
+from time import perf_counter
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+
+REQUEST_STAGE_SECONDS = metrics.histogram(
+    "astra_request_stage_seconds",
+    "Per-request time spent in each processing stage, by route",
+    labelnames=("method", "route", "stage"),
+)
+
+# Stage name -> accumulated seconds for the request being handled, or None when
+# timing is disabled (or outside a request), which turns every hook into a no-op.
+_stages: ContextVar[dict[str, float] | None] = ContextVar(
+    "request_stages", default=None
+)
+
+
+class timed:
+    """Context manager adding the elapsed time of its block to a request stage.
+
+    Repeated blocks with the same name accumulate, e.g. several DB queries.
+    """
+
+    __slots__ = ("stage", "stages", "start")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self) -> "timed":
+        self.stages = _stages.get()
+        if self.stages is not None:
+            self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.stages is not None:
+            elapsed = perf_counter() - self.start
+            self.stages[self.stage] = self.stages.get(self.stage, 0.0) + elapsed
+
+
+def _server_timing(stages: dict[str, float], total: float) -> str:
+    entries = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in stages.items()]
+    entries.append(f"total;dur={total * 1000:.3f}")
+    return ", ".join(entries)
+
+
+class ServerTimingMiddleware:
+    """Collects per-stage durations, emits ``Server-Timing`` and feeds /metrics."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stages: dict[str, float] = {}
+        token = _stages.set(stages)
+        start = perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing", _server_timing(stages, perf_counter() - start)
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            total = perf_counter() - start
+            _stages.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            for stage, seconds in stages.items():
+                REQUEST_STAGE_SECONDS.observe(
+                    seconds, method=method, route=route, stage=stage
+                )
+            REQUEST_STAGE_SECONDS.observe(
+                total, method=method, route=route, stage="total"
+            )
@@ -1,25 +1,295 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+import asyncio
+from time import monotonic, perf_counter, time
+
+import asyncpg
+from fastapi import Request, Response
+from sqlalchemy import event, text
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    create_async_engine,
+    AsyncSession,
+    async_sessionmaker,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core import metrics
 from app.core.config import CONFIG
 
-DB_URL = f"postgresql+asyncpg://{CONFIG.POSTGRES_USER}:{CONFIG.POSTGRES_PASSWORD}@db/{CONFIG.POSTGRES_DB}"
+DB_URL = f"postgresql+asyncpg://{CONFIG.POSTGRES_USER}:{CONFIG.POSTGRES_PASSWORD}@{CONFIG.POSTGRES_HOST}:{CONFIG.POSTGRES_PORT}/{CONFIG.POSTGRES_DB}"
+REPLICA_DB_URL = f"postgresql+asyncpg://{CONFIG.POSTGRES_USER}:{CONFIG.POSTGRES_PASSWORD}@{CONFIG.POSTGRES_REPLICA_HOST}:{CONFIG.POSTGRES_REPLICA_PORT}/{CONFIG.POSTGRES_DB}"
+
+POOL_CHECKOUT_WAIT = metrics.histogram(
+    "astra_db_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(perf_counter() - start)
+
+
+def _connect_args() -> dict:
+    connect_args: dict = {
+        # SQLAlchemy prepares statements itself and keeps them in its own
+        # per-connection LRU; asyncpg's cache covers the unprepared path.
+        "prepared_statement_cache_size": CONFIG.DB_STATEMENT_CACHE_SIZE,
+        "statement_cache_size": CONFIG.DB_STATEMENT_CACHE_SIZE,
+    }
+    if CONFIG.DB_STATEMENT_TIMEOUT_MS > 0:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(CONFIG.DB_STATEMENT_TIMEOUT_MS)
+        }
+    return connect_args
+
+
+def build_engine(url: str, **kwargs) -> AsyncEngine:
+    options = {
+        "echo": CONFIG.DB_ECHO,
+        "poolclass": InstrumentedAsyncPool,
+        "pool_size": CONFIG.DB_POOL_SIZE,
+        "max_overflow": CONFIG.DB_MAX_OVERFLOW,
+        "pool_timeout": CONFIG.DB_POOL_TIMEOUT,
+        "pool_recycle": CONFIG.DB_POOL_RECYCLE,
+        "pool_pre_ping": CONFIG.DB_POOL_PRE_PING,
+        "query_cache_size": CONFIG.DB_COMPILED_CACHE_SIZE,
+        "connect_args": _connect_args(),
+    }
+    return create_async_engine(url=url, **{**options, **kwargs})
+
 
-engine = create_async_engine(
-    url=DB_URL,
-    echo=True,
+# Created by init_engines(), which the app lifespan calls, so importing the
+# app builds no engine or pool; the session factories are bound at that point.
+engine: AsyncEngine | None = None
+replica_engine: AsyncEngine | None = None
+# One connection of its own for the background health check, so a busy app
+# pool never makes the database look unreachable.
+health_engine: AsyncEngine | None = None
+
+_SESSION_OPTIONS = {
+    "class_": AsyncSession,
+    "expire_on_commit": False,
+    "autocommit": False,
+    "autoflush": False,
+}
+AsyncSessionLocal = async_sessionmaker(**_SESSION_OPTIONS)
+ReadSessionLocal = async_sessionmaker(**_SESSION_OPTIONS)
+
+
+def _pool_stat(stat: str):
+    return lambda: getattr(engine.pool, stat)() if engine is not None else 0
+
+
+metrics.gauge(
+    "astra_db_pool_size",
+    "Configured number of persistent pool connections",
+    callback=_pool_stat("size"),
+)
+metrics.gauge(
+    "astra_db_pool_checked_out",
+    "Connections currently checked out of the pool (in use)",
+    callback=_pool_stat("checkedout"),
+)
+metrics.gauge(
+    "astra_db_pool_checked_in",
+    "Idle connections currently held by the pool",
+    callback=_pool_stat("checkedin"),
+)
+metrics.gauge(
+    "astra_db_pool_overflow",
+    "Connections open beyond pool_size (negative while the pool is filling)",
+    callback=_pool_stat("overflow"),
 )
 
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
+REPLICA_FALLBACKS = metrics.counter(
+    "astra_db_replica_fallbacks_total",
+    "Read connections opened on the primary because the replica was unavailable",
 )
 
 
+class ReplicaFallback:
+    """Opens read connections on the replica, or on the primary while it is down.
+
+    Hooked into the replica engine's connect step, so routing stays lazy: no
+    connection is made until a read session actually runs a query. After a
+    failed connect the replica is skipped for ``retry_after`` seconds; primary
+    connections opened meanwhile are discarded at checkout once it may be back.
+    """
+
+    def __init__(
+        self, primary_host: str, primary_port: int, retry_after: float, timeout: float
+    ):
+        self.primary_host = primary_host
+        self.primary_port = primary_port
+        self.retry_after = retry_after
+        self.timeout = timeout
+        self._down_until = 0.0
+
+    @property
+    def replica_available(self) -> bool:
+        return monotonic() >= self._down_until
+
+    def mark_failed(self) -> None:
+        self._down_until = monotonic() + self.retry_after
+
+    def on_connect(self, dialect, connection_record, cargs, cparams):
+        if self.replica_available:
+            try:
+                return dialect.connect(*cargs, **{"timeout": self.timeout, **cparams})
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError) as exc:
+                print(f"Read replica unavailable, reading from primary: {exc!r}")
+                self.mark_failed()
+        REPLICA_FALLBACKS.inc()
+        connection_record.info["replica_fallback"] = True
+        cparams.update(host=self.primary_host, port=self.primary_port)
+        return dialect.connect(*cargs, **cparams)
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        if connection_record.info.get("replica_fallback") and self.replica_available:
+            # The pool retries the checkout with a fresh (replica) connection.
+            raise DisconnectionError("Replica may be back; dropping primary fallback")
+
+
+def build_replica_engine(url: str, fallback: ReplicaFallback) -> AsyncEngine:
+    replica = build_engine(url)
+    event.listen(replica.sync_engine, "do_connect", fallback.on_connect)
+    event.listen(replica.sync_engine, "checkout", fallback.on_checkout)
+    return replica
+
+
+def init_engines() -> AsyncEngine:
+    """Create the primary (and replica) engine once and bind the session factories."""
+    global engine, replica_engine, health_engine
+    if engine is None:
+        engine = build_engine(DB_URL)
+        AsyncSessionLocal.configure(bind=engine)
+        health_engine = build_engine(
+            DB_URL, pool_size=1, max_overflow=0, pool_pre_ping=False
+        )
+        if CONFIG.POSTGRES_REPLICA_HOST:
+            replica_engine = build_replica_engine(
+                REPLICA_DB_URL,
+                ReplicaFallback(
+                    CONFIG.POSTGRES_HOST,
+                    CONFIG.POSTGRES_PORT,
+                    retry_after=CONFIG.DB_REPLICA_RETRY_SECONDS,
+                    timeout=CONFIG.DB_REPLICA_CONNECT_TIMEOUT,
+                ),
+            )
+            ReadSessionLocal.configure(bind=replica_engine)
+    return engine
+
+
+async def dispose_engines() -> None:
+    global engine, replica_engine, health_engine
+    for created in (engine, replica_engine, health_engine):
+        if created is not None:
+            await created.dispose()
+    engine = replica_engine = health_engine = None
+
+
+async def warm_pool(db_engine: AsyncEngine, connections: int) -> int:
+    """Open ``connections`` pooled connections at once so requests find them ready.
+
+    Capped at the pool size, since overflow connections would be closed again
+    on checkin; returns the number opened.
+    """
+    count = min(connections, db_engine.pool.size())
+    opened = [db_engine.connect() for _ in range(count)]
+    try:
+        await asyncio.gather(*(connection.start() for connection in opened))
+    finally:
+        for connection in opened:
+            if connection.sync_connection is not None:
+                await connection.close()
+    return count
+
+
+async def ping(db_engine: AsyncEngine, timeout: float) -> float:
+    """Run ``SELECT 1`` on ``db_engine`` and return the round trip in seconds.
+
+    Pass ``health_engine``: the timeout includes pool checkout, and only a
+    dedicated pool keeps that from measuring load instead of reachability.
+    """
+    started = perf_counter()
+    async with asyncio.timeout(timeout):
+        async with db_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    return perf_counter() - started
+
+
+def pool_status(db_engine: AsyncEngine | None) -> dict:
+    """Pool counters plus saturation: checked-out share of all allowed connections.
+
+    For engines from ``build_engine`` without pool overrides, whose overflow
+    limit is DB_MAX_OVERFLOW.
+    """
+    if db_engine is None:
+        return {"size": 0, "checked_out": 0, "overflow": 0, "saturation": 0.0}
+    pool = db_engine.pool
+    capacity = pool.size() + max(CONFIG.DB_MAX_OVERFLOW, 0)
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "saturation": round(pool.checkedout() / capacity, 3) if capacity else 0.0,
+    }
+
+
+# Unix time until which this client's reads go to the primary, set after its
+# own writes so it never reads a replica that has not caught up yet.
+READ_YOUR_WRITES_COOKIE = "astra_read_primary_until"
+
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         try:
             yield session
         finally:
             await session.close()
+
+
+def reads_pinned_to_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0)) > time()
+    except ValueError:
+        return False
+
+
+def pin_reads_to_primary(response: Response) -> None:
+    """Send this client's reads to the primary for READ_YOUR_WRITES_SECONDS."""
+    if replica_engine is None or CONFIG.READ_YOUR_WRITES_SECONDS <= 0:
+        return
+    response.set_cookie(
+        READ_YOUR_WRITES_COOKIE,
+        str(int(time() + CONFIG.READ_YOUR_WRITES_SECONDS)),
+        max_age=CONFIG.READ_YOUR_WRITES_SECONDS,
+        httponly=True,
+        samesite="lax",
+    )
+
+
+async def get_read_db(request: Request):
+    """Session for read-only work: the replica if configured, else the primary"""
+    sessionmaker = (
+        AsyncSessionLocal
+        if replica_engine is None or reads_pinned_to_primary(request)
+        else ReadSessionLocal
+    )
+    async with sessionmaker() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Session factory for work that outlives the request, e.g. background tasks"""
+    return AsyncSessionLocal
@@ -1,62 +1,436 @@
+import json
+from datetime import datetime
+from time import perf_counter
+
+from sqlalchemy import (
+    ClauseElement,
+    Executable,
+    delete,
+    func,
+    insert,
+    lambda_stmt,
+    not_,
+    or_,
+    tuple_,
+    update,
+)
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.db.models.models import User
-from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.schemas.user import UserCreate, UserUpdate, UserPrincipal, UserRole
+from app.core.cache import TTLCache
+from app.core.config import CONFIG
+from app.core.exceptions import UserAlreadyExistsError
+from app.core.security import (
+    auth_latency,
+    dummy_verify_async,
+    hash_password_async,
+    verify_password_async,
+)
+from app.core.timing import timed
+from app.db.token_versions import token_versions
+
+# Keyed by username (the access token subject); invalidated on update/delete.
+principal_cache: TTLCache[str, UserPrincipal] = TTLCache(
+    maxsize=CONFIG.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=CONFIG.PRINCIPAL_CACHE_TTL_SECONDS,
+    name="principal",
+)
+
+# Lowercased usernames recently looked up and not found; cleared when taken,
+# here directly and on other workers by their next sync_user_changes poll.
+unknown_username_cache: TTLCache[str, bool] = TTLCache(
+    maxsize=CONFIG.UNKNOWN_USER_CACHE_MAX_SIZE,
+    ttl=CONFIG.UNKNOWN_USER_CACHE_TTL_SECONDS,
+    name="unknown_username",
+)
+
+
+# Soft-deleted accounts are invisible everywhere except the purge worker.
+_live = User.deleted_at.is_(None)
+
+
+def _username_is(username: str):
+    # Same expression as the uq_auth_users_username_ci index, so it is used.
+    return func.lower(User.username) == func.lower(username)
+
+
+def _email_is(email: str):
+    return func.lower(User.email) == func.lower(email)
+
+
+# The hot lookups are lambda statements: SQLAlchemy builds and compiles each
+# shape once and afterwards only extracts the new bound value, and asyncpg then
+# reuses the prepared statement (DB_STATEMENT_CACHE_SIZE per connection).
 
 
 async def get_user_by_username(db: AsyncSession, username: str) -> User | None:
-    result = await db.execute(select(User).where(User.username == username))
+    stmt = lambda_stmt(lambda: select(User).where(_username_is(username), _live))
+    with timed("db"):
+        result = await db.execute(stmt)
     return result.scalar_one_or_none()
 
 
 async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
-    result = await db.execute(select(User).where(User.email == email))
+    stmt = lambda_stmt(lambda: select(User).where(_email_is(email), _live))
+    with timed("db"):
+        result = await db.execute(stmt)
     return result.scalar_one_or_none()
 
 
+# Just what authorization needs, fetched as a plain row: no ORM identity map
+# bookkeeping or attribute instrumentation for read-only checks.
+_PRINCIPAL_COLUMNS = tuple(getattr(User, field) for field in UserPrincipal.model_fields)
+
+
+async def get_principal_row(db: AsyncSession, username: str) -> UserPrincipal | None:
+    stmt = lambda_stmt(
+        lambda: select(*_PRINCIPAL_COLUMNS).where(_username_is(username), _live)
+    )
+    with timed("db"):
+        row = (await db.execute(stmt)).first()
+    return None if row is None else UserPrincipal(**row._mapping)
+
+
+async def get_principal_by_username(
+    db: AsyncSession, username: str
+) -> UserPrincipal | None:
+    principal = principal_cache.get(username)
+    if principal is not None:
+        # Another worker may have changed the user since it was cached here;
+        # the polled version map notices that before the cache entry expires.
+        if not token_versions.is_stale(principal.id, principal.token_version):
+            return principal
+        principal_cache.pop(username)
+    principal = await get_principal_row(db, username)
+    if principal is not None:
+        principal_cache.set(username, principal)
+        token_versions.set(principal.id, principal.token_version)
+    return principal
+
+
+async def sync_user_changes(db: AsyncSession) -> None:
+    """Apply user changes made by other workers to this process's caches."""
+    for username in await token_versions.sync(db):
+        unknown_username_cache.pop(username.lower())
+
+
+def remember_principal(user: User) -> UserPrincipal:
+    """Snapshot a freshly loaded user into the principal cache."""
+    principal = UserPrincipal.model_validate(user)
+    principal_cache.set(user.username, principal)
+    token_versions.set(user.id, user.token_version)
+    return principal
+
+
+def _conflicting_field(exc: IntegrityError) -> str | None:
+    """Map a unique violation on auth_users back to the offending field."""
+    cause = getattr(exc.orig, "__cause__", None)
+    if getattr(cause, "sqlstate", None) != "23505":
+        return None
+    constraint = getattr(cause, "constraint_name", None) or ""
+    return "email" if "email" in constraint else "username"
+
+
+class _Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` wrapper that keeps the inner statement's binds."""
+
+    inherit_cache = False
+
+    def __init__(self, stmt):
+        self.stmt = stmt
+
+
+@compiles(_Explain)
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.stmt, **kw)
+
+
+def _prefix_pattern(prefix: str) -> str:
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+def _user_list_filters(
+    role: UserRole | None = None,
+    is_active: bool | None = None,
+    username_prefix: str | None = None,
+    email_prefix: str | None = None,
+) -> list:
+    criteria = [_live]
+    if role is not None:
+        criteria.append(User.role == role)
+    if is_active is not None:
+        # Rendered as a literal predicate so the partial index can be matched.
+        criteria.append(User.is_active if is_active else not_(User.is_active))
+    # Matched case-insensitively like the identities themselves; lower(col)
+    # is the expression the *_ci_pattern indexes are built on.
+    if username_prefix:
+        criteria.append(
+            func.lower(User.username).like(
+                _prefix_pattern(username_prefix.lower()), escape="\\"
+            )
+        )
+    if email_prefix:
+        criteria.append(
+            func.lower(User.email).like(
+                _prefix_pattern(email_prefix.lower()), escape="\\"
+            )
+        )
+    return criteria
+
+
+async def list_users(
+    db: AsyncSession,
+    *,
+    limit: int,
+    after: tuple[datetime, int] | None = None,
+    role: UserRole | None = None,
+    is_active: bool | None = None,
+    username_prefix: str | None = None,
+    email_prefix: str | None = None,
+) -> list[User]:
+    """Newest-first keyset page of users strictly after the (created_at, id) key."""
+    stmt = (
+        select(User)
+        .where(*_user_list_filters(role, is_active, username_prefix, email_prefix))
+        .order_by(User.created_at.desc(), User.id.desc())
+        .limit(limit)
+    )
+    if after is not None:
+        stmt = stmt.where(tuple_(User.created_at, User.id) < tuple_(*after))
+    with timed("db"):
+        result = await db.execute(stmt)
+    return list(result.scalars().all())
+
+
+async def approximate_user_count(
+    db: AsyncSession,
+    role: UserRole | None = None,
+    is_active: bool | None = None,
+    username_prefix: str | None = None,
+    email_prefix: str | None = None,
+) -> int:
+    """Planner row estimate for the filtered listing; O(1) regardless of table size."""
+    stmt = select(User.id).where(
+        *_user_list_filters(role, is_active, username_prefix, email_prefix)
+    )
+    plan = (await db.execute(_Explain(stmt))).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return max(int(plan[0]["Plan"]["Plan Rows"]), 0)
+
+
 async def create_user(db: AsyncSession, user_create: UserCreate) -> User:
-    new_user = User(
-        username=user_create.username,
-        email=user_create.email,
-        hashed_password=get_password_hash(user_create.password),
-        is_active=True,
-        role="user",
-    )
-    db.add(new_user)
-    await db.commit()
-    await db.refresh(new_user)
+    # One INSERT ... RETURNING; the unique constraints decide duplicates, which
+    # stays correct when concurrent signups race for the same username/email.
+    stmt = (
+        insert(User)
+        .values(
+            username=user_create.username,
+            email=user_create.email,
+            hashed_password=await hash_password_async(user_create.password),
+            is_active=True,
+            role="user",
+        )
+        .returning(User)
+    )
+    try:
+        with timed("db"):
+            new_user = (await db.execute(stmt)).scalar_one()
+            await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        field = _conflicting_field(exc)
+        if field is None:
+            raise
+        raise UserAlreadyExistsError(field) from exc
+    unknown_username_cache.pop(new_user.username.lower())
     return new_user
 
 
+async def bulk_insert_users(db: AsyncSession, rows: list[dict]) -> set[tuple[str, str]]:
+    """Insert pre-hashed user rows in one statement, skipping conflicts.
+
+    Returns the (username, email) pairs that were actually inserted; rows
+    clashing with an existing username or email are silently left out.
+    """
+    if not rows:
+        return set()
+    stmt = pg_insert(User).on_conflict_do_nothing().returning(User.username, User.email)
+    result = await db.execute(stmt, rows)
+    inserted = {(username, email) for username, email in result.all()}
+    await db.commit()
+    for username, _ in inserted:
+        unknown_username_cache.pop(username.lower())
+    return inserted
+
+
+# Changing any of these must invalidate tokens issued before the change.
+_TOKEN_BOUND_FIELDS = ("username", "role", "is_active")
+
+
 async def update_user(db: AsyncSession, db_user: User, user_update: UserUpdate) -> User:
+    """Apply the changed fields in one ``UPDATE ... RETURNING`` statement.
+
+    ``db_user`` is refreshed from the returned row, so no follow-up SELECT is
+    needed; unique violations surface as UserAlreadyExistsError.
+    """
     update_data = user_update.model_dump(exclude_unset=True)
+    previous_username = db_user.username
 
-    for key, value in update_data.items():
-        if key == "password":
-            hashed_value = get_password_hash(value)
-            setattr(db_user, "hashed_password", hashed_value)
-        else:
-            setattr(db_user, key, value)
+    values = {
+        key: value
+        for key, value in update_data.items()
+        if key != "password" and value != getattr(db_user, key)
+    }
+    if "password" in update_data:
+        values["hashed_password"] = await hash_password_async(update_data["password"])
+    if not values:
+        return db_user
+    if "hashed_password" in values or any(
+        field in values for field in _TOKEN_BOUND_FIELDS
+    ):
+        values["token_version"] = User.token_version + 1
 
-    db.add(db_user)
-    await db.commit()
-    await db.refresh(db_user)
+    stmt = (
+        update(User)
+        .where(User.id == db_user.id)
+        .values(**values)
+        .returning(User)
+        .execution_options(populate_existing=True)
+    )
+    try:
+        with timed("db"):
+            db_user = (await db.execute(stmt)).scalar_one()
+            await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        field = _conflicting_field(exc)
+        if field is None:
+            raise
+        raise UserAlreadyExistsError(field) from exc
 
+    principal_cache.pop(previous_username)
+    principal_cache.pop(db_user.username)
+    unknown_username_cache.pop(db_user.username.lower())
+    token_versions.set(db_user.id, db_user.token_version)
     return db_user
 
 
+async def batch_update_users(
+    db: AsyncSession,
+    ids: list[int],
+    *,
+    is_active: bool | None = None,
+    role: UserRole | None = None,
+) -> list[int]:
+    """Set ``is_active`` and/or ``role`` on many users in one statement.
+
+    Rows already holding the requested values are left untouched, so their
+    tokens stay valid; returns the ids that actually changed. Other workers
+    stop accepting the changed users' tokens after their next version poll.
+    """
+    values: dict = {}
+    changed = []
+    if is_active is not None:
+        values["is_active"] = is_active
+        changed.append(User.is_active.is_distinct_from(is_active))
+    if role is not None:
+        values["role"] = role
+        changed.append(User.role.is_distinct_from(role))
+    if not values or not ids:
+        return []
+    values["token_version"] = User.token_version + 1
+
+    stmt = (
+        update(User)
+        .where(User.id.in_(ids), _live, or_(*changed))
+        .values(**values)
+        .returning(User.id, User.username, User.token_version)
+        .execution_options(synchronize_session=False)
+    )
+    with timed("db"):
+        rows = (await db.execute(stmt)).all()
+        await db.commit()
+
+    for user_id, username, token_version in rows:
+        principal_cache.pop(username)
+        token_versions.set(user_id, token_version)
+    return sorted(user_id for user_id, _, _ in rows)
+
+
+async def update_password_hash(
+    db: AsyncSession, user_id: int, old_hash: str, new_hash: str
+) -> bool:
+    """Swap in an upgraded hash of the same password.
+
+    Only applies while the stored hash is still ``old_hash``, so a password
+    changed in the meantime is never overwritten.
+    """
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id, User.hashed_password == old_hash)
+        .values(hashed_password=new_hash)
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+
 async def delete_user(db: AsyncSession, db_user: User) -> None:
-    await db.delete(db_user)
+    """Soft-delete: hide the account at once and leave the row to the purge worker.
+
+    Bumping the token version makes every outstanding token fail its check.
+    """
+    stmt = (
+        update(User)
+        .where(User.id == db_user.id)
+        .values(deleted_at=func.now(), token_version=User.token_version + 1)
+    )
+    with timed("db"):
+        await db.execute(stmt)
+        await db.commit()
+    principal_cache.pop(db_user.username)
+    token_versions.discard(db_user.id)
+
+
+async def purge_deleted_users(
+    db: AsyncSession, batch_size: int, older_than: datetime
+) -> int:
+    """Hard-delete up to ``batch_size`` users soft-deleted before ``older_than``.
+
+    Rows are claimed with SKIP LOCKED, so several workers can purge side by
+    side; returns the number of rows removed.
+    """
+    doomed = (
+        select(User.id)
+        .where(User.deleted_at.is_not(None), User.deleted_at <= older_than)
+        .order_by(User.deleted_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.execute(delete(User).where(User.id.in_(doomed.scalar_subquery())))
     await db.commit()
+    return result.rowcount
 
 
 async def authenticate_user(
     db: AsyncSession, username: str, password: str
 ) -> User | None:
+    # Unknown usernames must not answer faster than wrong passwords, or the
+    # latency reveals which accounts exist; see dummy_verify_async.
+    started = perf_counter()
+    if unknown_username_cache.get(username.lower()):
+        await dummy_verify_async(started)
+        return None
     user = await get_user_by_username(db, username)
     if not user:
+        unknown_username_cache.set(username.lower(), True)
+        await dummy_verify_async(started)
         return None
-    if not verify_password(password, user.hashed_password):
-        return None
-    return user
+    verified = await verify_password_async(password, user.hashed_password)
+    auth_latency.record(perf_counter() - started)
+    return user if verified else None
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import String, DateTime, func
+from sqlalchemy import String, DateTime, Index, func, text
 from sqlalchemy.orm import declarative_base, Mapped, mapped_column
 from app.schemas.user import UserRole
 
@@ -8,12 +8,60 @@ Base = declarative_base()
 
 class User(Base):
     __tablename__ = "auth_users"
+    __table_args__ = (
+        # Keyset pagination for the admin user listing on (created_at, id)
+        Index("ix_auth_users_created_at_id", "created_at", "id"),
+        Index("ix_auth_users_role_created_at_id", "role", "created_at", "id"),
+        Index(
+            "ix_auth_users_inactive_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("NOT is_active"),
+        ),
+        # Case-insensitive prefix (lower(col) LIKE 'abc%') searches regardless
+        # of the database collation
+        Index(
+            "ix_auth_users_username_ci_pattern",
+            text("lower(username) text_pattern_ops"),
+        ),
+        Index(
+            "ix_auth_users_email_ci_pattern",
+            text("lower(email) text_pattern_ops"),
+        ),
+        # Incremental polling of the token version map
+        Index("ix_auth_users_updated_at", "updated_at"),
+        # Case-insensitive uniqueness among live accounts only, so a deleted
+        # user's name and email can be reused before the purge worker runs.
+        # Lookups compare lower(column) to hit these indexes.
+        Index(
+            "uq_auth_users_username_ci",
+            text("lower(username)"),
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "uq_auth_users_email_ci",
+            text("lower(email)"),
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # Purge queue: only soft-deleted rows are indexed
+        Index(
+            "ix_auth_users_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    username: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
-    email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+    username: Mapped[str] = mapped_column(String(50), nullable=False)
+    email: Mapped[str] = mapped_column(String(255), nullable=False)
     role: Mapped[UserRole] = mapped_column(default=UserRole.USER, nullable=False)
     hashed_password: Mapped[str] = mapped_column(nullable=False)
     is_active: Mapped[bool] = mapped_column(nullable=False, default=True)
+    # Embedded in issued tokens; bumping it invalidates every outstanding token.
+    token_version: Mapped[int] = mapped_column(
+        nullable=False, default=0, server_default=text("0")
+    )
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -28,5 +76,24 @@ class User(Base):
         nullable=False,
     )
 
+    # Set on account deletion; the row is hard-deleted later by the purge worker.
+    deleted_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
     def __repr__(self) -> str:
         return f"User(id={self.id}, username='{self.username}')"
+
+
+class RevokedToken(Base):
+    """Denylisted refresh token ids (jti) and revoked token families."""
+
+    __tablename__ = "revoked_tokens"
+    token_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(16), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+
+    def __repr__(self) -> str:
+        return f"RevokedToken(token_id='{self.token_id}', kind='{self.kind}')"
@@ -0,0 +1,137 @@
+from datetime import datetime, timezone
+from typing import Protocol
+
+from sqlalchemy import delete, exists, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import CONFIG
+from app.db.models.models import RevokedToken
+
+
+class RevocationStore(Protocol):
+    """Denylist for rotating refresh tokens.
+
+    ``consume`` is the only call on the refresh hot path: it atomically marks a
+    token id as used and reports whether it was still valid, so rotation and
+    reuse detection cost a single lookup.
+    """
+
+    async def consume(
+        self, db: AsyncSession, jti: str, family: str, expires_at: datetime
+    ) -> bool: ...
+
+    async def revoke_family(
+        self, db: AsyncSession, family: str, expires_at: datetime
+    ) -> None: ...
+
+    async def prune(self, db: AsyncSession) -> int: ...
+
+    def clear_local(self) -> None: ...
+
+
+class MemoryRevocationStore:
+    """Process-local store; only suitable for a single worker or for tests."""
+
+    def __init__(self):
+        self._revoked: dict[str, datetime] = {}
+
+    async def consume(
+        self, db: AsyncSession, jti: str, family: str, expires_at: datetime
+    ) -> bool:
+        if jti in self._revoked or family in self._revoked:
+            return False
+        self._revoked[jti] = expires_at
+        return True
+
+    async def revoke_family(
+        self, db: AsyncSession, family: str, expires_at: datetime
+    ) -> None:
+        self._revoked[family] = expires_at
+
+    async def prune(self, db: AsyncSession) -> int:
+        now = datetime.now(timezone.utc)
+        expired = [key for key, expires in self._revoked.items() if expires <= now]
+        for key in expired:
+            del self._revoked[key]
+        return len(expired)
+
+    def clear_local(self) -> None:
+        self._revoked.clear()
+
+
+class PostgresRevocationStore:
+    """``revoked_tokens`` table fronted by an in-process set of known-revoked ids.
+
+    Ids this process has already seen revoked are rejected without touching the
+    database; everything else is decided by one INSERT ... ON CONFLICT statement.
+    """
+
+    def __init__(self, local_cache_size: int):
+        self._known_revoked: TTLCache[str, bool] = TTLCache(
+            maxsize=local_cache_size,
+            ttl=CONFIG.REFRESH_TOKEN_EXPIRE_MINUTES * 60,
+            name="revoked_token",
+        )
+
+    def _remember(self, token_id: str, expires_at: datetime) -> None:
+        ttl = (expires_at - datetime.now(timezone.utc)).total_seconds()
+        self._known_revoked.set(token_id, True, ttl=ttl)
+
+    async def consume(
+        self, db: AsyncSession, jti: str, family: str, expires_at: datetime
+    ) -> bool:
+        if jti in self._known_revoked or family in self._known_revoked:
+            return False
+
+        family_revoked = exists().where(RevokedToken.token_id == family)
+        stmt = (
+            pg_insert(RevokedToken)
+            .from_select(
+                ["token_id", "kind", "expires_at"],
+                select(literal(jti), literal("refresh"), literal(expires_at)).where(
+                    ~family_revoked
+                ),
+            )
+            .on_conflict_do_nothing(index_elements=["token_id"])
+            .returning(RevokedToken.token_id)
+        )
+        consumed = (await db.execute(stmt)).scalar_one_or_none() is not None
+        await db.commit()
+
+        self._remember(jti, expires_at)
+        return consumed
+
+    async def revoke_family(
+        self, db: AsyncSession, family: str, expires_at: datetime
+    ) -> None:
+        stmt = (
+            pg_insert(RevokedToken)
+            .values(token_id=family, kind="family", expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=["token_id"])
+        )
+        await db.execute(stmt)
+        await db.commit()
+        self._remember(family, expires_at)
+
+    async def prune(self, db: AsyncSession) -> int:
+        result = await db.execute(
+            delete(RevokedToken).where(
+                RevokedToken.expires_at <= datetime.now(timezone.utc)
+            )
+        )
+        await db.commit()
+        return result.rowcount
+
+    def clear_local(self) -> None:
+        self._known_revoked.clear()
+
+
+def build_revocation_store() -> RevocationStore:
+    if CONFIG.REVOCATION_BACKEND == "memory":
+        return MemoryRevocationStore()
+    return PostgresRevocationStore(local_cache_size=CONFIG.REVOCATION_LOCAL_CACHE_SIZE)
+
+
+revocation_store: RevocationStore = build_revocation_store()
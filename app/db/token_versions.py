@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import CACHE_REQUESTS, TTLCache
+from app.core.config import CONFIG
+from app.db.models.models import User
+
+# updated_at is the transaction start time, so a row committed late can carry a
+# timestamp older than the watermark; re-reading a short window catches those.
+POLL_LOOKBACK = timedelta(seconds=30)
+
+
+class TokenVersionMap:
+    """In-process copy of ``auth_users.token_version`` for recently seen users.
+
+    Filled lazily, one user id at a time, whenever this process reads a user's
+    current version from the database (login, refresh, principal lookups), and
+    bounded as an LRU, so it grows with active users rather than the table.
+    ``sync`` only invalidates: it reads rows whose ``updated_at`` moved past the
+    watermark and updates or drops the ids already held. Entries also expire
+    after ``ttl`` as a backstop should a poll miss a change.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._versions: TTLCache[int, int] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._watermark: datetime | None = None
+
+    @property
+    def ready(self) -> bool:
+        # Until the first poll has set a watermark, changes made by other
+        # workers could go unnoticed, so nothing is remembered or trusted.
+        return self._watermark is not None
+
+    def __len__(self) -> int:
+        return len(self._versions)
+
+    def get(self, user_id: int) -> int | None:
+        """The known current version of ``user_id``, if the map holds one."""
+        return self._versions.get(user_id) if self.ready else None
+
+    def is_current(self, user_id: int, version: int) -> bool:
+        """True only if the map is loaded and knows ``user_id`` at ``version``."""
+        current = self.get(user_id) == version
+        CACHE_REQUESTS.inc(cache="token_version", result="hit" if current else "miss")
+        return current
+
+    def is_stale(self, user_id: int, version: int) -> bool:
+        """True if the map knows ``user_id`` at a version other than ``version``."""
+        known = self.get(user_id)
+        return known is not None and known != version
+
+    def set(self, user_id: int, version: int) -> None:
+        """Record a version just read from (or written to) the database."""
+        if self.ready:
+            self._versions.set(user_id, version)
+
+    def discard(self, user_id: int) -> None:
+        self._versions.pop(user_id)
+
+    def clear(self) -> None:
+        self._versions.clear()
+        self._watermark = None
+
+    async def sync(self, db: AsyncSession) -> list[str]:
+        """Apply version changes to the ids held.
+
+        Returns the usernames of the live users that changed (or were created),
+        so callers can invalidate other per-process caches keyed by username.
+        """
+        if self._watermark is None:
+            self._watermark = (await db.execute(select(func.now()))).scalar_one()
+            return []
+
+        stmt = select(
+            User.id, User.username, User.token_version, User.updated_at, User.deleted_at
+        ).where(User.updated_at >= self._watermark - POLL_LOOKBACK)
+        rows = (await db.execute(stmt)).all()
+
+        changed = []
+        for user_id, username, version, _, deleted_at in rows:
+            if deleted_at is not None:
+                self._versions.pop(user_id)
+                continue
+            changed.append(username)
+            if user_id in self._versions:
+                self._versions.set(user_id, version)
+        if rows:
+            newest = max(row.updated_at for row in rows)
+            if newest > self._watermark:
+                self._watermark = newest
+        return changed
+
+
+token_versions = TokenVersionMap(
+    maxsize=CONFIG.TOKEN_VERSION_CACHE_SIZE,
+    ttl=CONFIG.TOKEN_VERSION_CACHE_TTL_SECONDS,
+)
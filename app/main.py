@@ -1,9 +1,14 @@
-from fastapi import FastAPI, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
-from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from contextlib import asynccontextmanager, suppress
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
 
-from app.db.connection import get_db, engine
+from app.db import crud
+from app.db import connection
+from app.db.connection import AsyncSessionLocal
+from app.db.revocation import revocation_store
 from app.core.config import CONFIG
 from app.core.exceptions import (
     UserAlreadyExistsError,
@@ -14,10 +19,112 @@ from app.core.exceptions import (
     InsufficientPermissionsError,
     InvalidPasswordConfirmationError,
     InvalidConfirmationTextError,
+    ServiceOverloadedError,
+    RateLimitExceededError,
+    InvalidCursorError,
+    PreconditionFailedError,
 )
-from app.core import handlers
+from app.core import handlers, security
+from app.core.health import readiness
+from app.core.security import hashing_pool
+from app.core.timing import ServerTimingMiddleware
+from app.core.responses import FastJSONResponse
+from app.api import monitoring, well_known
 from app.api.v1.endpoints import auth, users, admin, moderator
 
+logger = logging.getLogger(__name__)
+
+
+async def warm_up():
+    """Prime hashing, JWT and the connection pool, then report ready on /readyz"""
+    started = perf_counter()
+    # Until both steps succeed /readyz stays 503 and reports the last failure;
+    # an unhandled error here would end the task and leave it "starting" forever.
+    while True:
+        try:
+            await security.warm_up()
+            break
+        except Exception as exc:
+            logger.exception("Warm-up of hashing/JWT failed, retrying")
+            readiness.record_warm_up_error(f"security: {exc!r}")
+            await asyncio.sleep(CONFIG.WARM_UP_RETRY_SECONDS)
+    while True:
+        try:
+            opened = await connection.warm_pool(
+                connection.init_engines(), CONFIG.DB_WARMUP_CONNECTIONS
+            )
+            break
+        except Exception as exc:
+            print(f"Warm-up could not reach the database: {exc!r}")
+            readiness.record_warm_up_error(f"database: {exc!r}")
+            await asyncio.sleep(CONFIG.WARM_UP_RETRY_SECONDS)
+    readiness.mark_warmed_up(perf_counter() - started)
+    print(
+        f"Warm-up done in {readiness.warm_up_seconds * 1000:.0f} ms "
+        f"({opened} pooled connection(s) open)"
+    )
+
+
+async def check_database():
+    """Run one database check and record it for /readyz"""
+    try:
+        latency = await connection.ping(
+            connection.health_engine, CONFIG.HEALTH_CHECK_TIMEOUT_SECONDS
+        )
+    except Exception as exc:
+        readiness.record_database(False, 0.0, error=repr(exc))
+    else:
+        readiness.record_database(True, latency)
+
+
+async def poll_database():
+    """Keep the cached database check fresh so probes never query the database"""
+    while True:
+        await check_database()
+        await asyncio.sleep(CONFIG.HEALTH_CHECK_INTERVAL_SECONDS)
+
+
+async def prune_revoked_tokens():
+    """Periodically drop revocation entries whose tokens have expired anyway"""
+    while True:
+        await asyncio.sleep(CONFIG.REVOCATION_PRUNE_INTERVAL_SECONDS)
+        try:
+            async with AsyncSessionLocal() as db:
+                await revocation_store.prune(db)
+        except Exception as exc:
+            print(f"Pruning revoked tokens failed: {exc!r}")
+
+
+async def purge_deleted_users():
+    """Hard-delete soft-deleted accounts in bounded, throttled batches"""
+    while True:
+        await asyncio.sleep(CONFIG.USER_PURGE_INTERVAL_SECONDS)
+        older_than = datetime.now(timezone.utc) - timedelta(
+            seconds=CONFIG.USER_PURGE_DELAY_SECONDS
+        )
+        try:
+            async with AsyncSessionLocal() as db:
+                while (
+                    await crud.purge_deleted_users(
+                        db, CONFIG.USER_PURGE_BATCH_SIZE, older_than
+                    )
+                    == CONFIG.USER_PURGE_BATCH_SIZE
+                ):
+                    await asyncio.sleep(CONFIG.USER_PURGE_BATCH_PAUSE_SECONDS)
+        except Exception as exc:
+            print(f"Purging deleted users failed: {exc!r}")
+
+
+async def poll_token_versions():
+    """Keep the token version map and unknown-username cache in step with auth_users"""
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                await crud.sync_user_changes(db)
+        except Exception as exc:
+            print(f"Syncing token versions failed: {exc!r}")
+        await asyncio.sleep(CONFIG.TOKEN_VERSION_POLL_INTERVAL_SECONDS)
+
 
 # Lifespan events to initialize the database connection
 @asynccontextmanager
@@ -25,12 +132,31 @@ async def lifespan(app: FastAPI):
     if not CONFIG.SECRET_KEY:
         raise ValueError("SECRET_KEY is not set in the configuration.")
     print("Starting up...")
+    connection.init_engines()
+    tasks = [
+        asyncio.create_task(warm_up()),
+        asyncio.create_task(poll_database()),
+        asyncio.create_task(prune_revoked_tokens()),
+    ]
+    if CONFIG.TOKEN_VERSION_POLL_INTERVAL_SECONDS > 0:
+        tasks.append(asyncio.create_task(poll_token_versions()))
+    if CONFIG.USER_PURGE_INTERVAL_SECONDS > 0:
+        tasks.append(asyncio.create_task(purge_deleted_users()))
     yield
     print("Shutting down...")
-    await engine.dispose()
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    readiness.reset()
+    hashing_pool.shutdown()
+    await connection.dispose_engines()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+
+if CONFIG.TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
 
 # Register global exception handlers
 app.add_exception_handler(UserAlreadyExistsError, handlers.user_already_exists_handler)
@@ -47,6 +173,10 @@ app.add_exception_handler(
 app.add_exception_handler(
     InvalidConfirmationTextError, handlers.invalid_confirmation_text_handler
 )
+app.add_exception_handler(ServiceOverloadedError, handlers.service_overloaded_handler)
+app.add_exception_handler(RateLimitExceededError, handlers.rate_limit_exceeded_handler)
+app.add_exception_handler(InvalidCursorError, handlers.invalid_cursor_handler)
+app.add_exception_handler(PreconditionFailedError, handlers.precondition_failed_handler)
 
 
 @app.get("/")
@@ -54,24 +184,8 @@ def root():
     return {"message": "Hello, World!"}
 
 
-@app.get("/test-db")
-async def test_db(db: AsyncSession = Depends(get_db)):
-    """Test endpoint to verify database connection and session management"""
-    result = await db.execute(
-        text("SELECT 1 as test, current_database(), current_user")
-    )
-    row = result.first()
-    if row is None:
-        return {"status": "error", "message": "No result from database"}
-    return {
-        "status": "connected",
-        "test_query": row[0],
-        "database": row[1],
-        "user": row[2],
-        "session_closed": False,
-    }
-
-
+app.include_router(monitoring.router)
+app.include_router(well_known.router)
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(users.router, prefix="/api/v1")
 app.include_router(admin.router, prefix="/api/v1")
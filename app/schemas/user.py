@@ -1,4 +1,11 @@
-from pydantic import BaseModel, EmailStr, Field, AfterValidator, ConfigDict
+from pydantic import (
+    BaseModel,
+    EmailStr,
+    Field,
+    AfterValidator,
+    ConfigDict,
+    model_validator,
+)
 from datetime import datetime
 from enum import Enum
 from typing import Optional, Annotated
@@ -55,6 +62,58 @@ class UserResponse(UserBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class UserPrincipal(BaseModel):
+    """Compact snapshot of the authenticated user used for authorization."""
+
+    id: int
+    username: str
+    role: UserRole
+    is_active: bool
+    token_version: int = 0
+    # Absent when the principal was built from token claims alone.
+    updated_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
+class UserBatchUpdate(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=1000)
+    is_active: Optional[bool] = None
+    role: Optional[UserRole] = None
+
+    @model_validator(mode="after")
+    def require_change(self) -> "UserBatchUpdate":
+        if self.is_active is None and self.role is None:
+            raise ValueError("Set at least one of is_active or role.")
+        return self
+
+
+class UserBatchUpdateResult(BaseModel):
+    updated: int
+    ids: list[int]
+
+
+class UserPage(BaseModel):
+    items: list[UserResponse]
+    next_cursor: str | None = None
+    approximate_total: int
+
+
+class UserImportRowError(BaseModel):
+    line: int
+    username: str | None = None
+    detail: str
+
+
+class UserImportReport(BaseModel):
+    total: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: list[UserImportRowError] = []
+    # Why the import stopped early; batches committed before that are kept.
+    aborted: str | None = None
+
+
 class Token(BaseModel):
     access_token: str
     refresh_token: str
@@ -1,45 +1,95 @@
-from datetime import timedelta
-from sqlalchemy.ext.asyncio import AsyncSession
+import uuid
+from datetime import datetime, timedelta, timezone
+from fastapi import BackgroundTasks
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.db import crud
+from app.db.revocation import revocation_store
+from app.db.token_versions import token_versions
 from app.db.models.models import User
 from app.core.config import CONFIG
 from app.core import security
 from app.core.exceptions import (
-    UserAlreadyExistsError,
     InvalidCredentialsError,
     InactiveUserError,
     InvalidTokenError,
+    ServiceOverloadedError,
 )
-from app.schemas.user import UserCreate, Token
+from app.schemas.user import UserCreate, UserRole, Token
 
 
 async def register_user(db: AsyncSession, user_create: UserCreate) -> User:
-    existing_user = await crud.get_user_by_username(db, user_create.username)
-    if existing_user:
-        raise UserAlreadyExistsError("username")
-    existing_email = await crud.get_user_by_email(db, user_create.email)
-    if existing_email:
-        raise UserAlreadyExistsError("email")
-    new_user = await crud.create_user(db, user_create)
-    return new_user
+    # Duplicate usernames/emails surface from crud.create_user as
+    # UserAlreadyExistsError, straight from the unique constraints.
+    return await crud.create_user(db, user_create)
 
 
-async def login_user(db: AsyncSession, username: str, password: str) -> Token:
+def _access_claims(user: User) -> dict:
+    # uid/role/ver let authorization skip the database while "ver" still
+    # matches the user's current token_version (see app.db.token_versions).
+    # The row was just read, so its version seeds this worker's map as well.
+    token_versions.set(user.id, user.token_version)
+    return {
+        "sub": user.username,
+        "uid": user.id,
+        "role": UserRole(user.role).value,
+        "ver": user.token_version,
+    }
+
+
+async def rehash_password(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    user_id: int,
+    old_hash: str,
+    password: str,
+) -> None:
+    """Re-hash a just-verified password with the current scheme and rounds."""
+    try:
+        new_hash = await security.hash_password_async(password)
+    except ServiceOverloadedError:
+        return  # The hash stays outdated and is retried on the next login.
+    async with sessionmaker() as db:
+        await crud.update_password_hash(db, user_id, old_hash, new_hash)
+
+
+async def login_user(
+    db: AsyncSession,
+    username: str,
+    password: str,
+    background_tasks: BackgroundTasks | None = None,
+    sessionmaker: async_sessionmaker[AsyncSession] | None = None,
+) -> Token:
     user = await crud.authenticate_user(db, username, password)
     if not user:
         raise InvalidCredentialsError()
     if not user.is_active:
         raise InactiveUserError()
 
+    # Upgrading the hash costs a full hash, so it runs after the response.
+    if (
+        background_tasks is not None
+        and sessionmaker is not None
+        and security.password_needs_rehash(user.hashed_password)
+    ):
+        background_tasks.add_task(
+            rehash_password, sessionmaker, user.id, user.hashed_password, password
+        )
+
     access_token_expires = timedelta(minutes=CONFIG.ACCESS_TOKEN_EXPIRE_MINUTES)
     refresh_token_expires = timedelta(minutes=CONFIG.REFRESH_TOKEN_EXPIRE_MINUTES)
 
     access_token = security.create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data=_access_claims(user), expires_delta=access_token_expires
     )
+    # Each login starts a new refresh token family; rotations stay inside it.
     refresh_token = security.create_refresh_token(
-        data={"sub": user.username}, expires_delta=refresh_token_expires
+        data={
+            "sub": user.username,
+            "uid": user.id,
+            "ver": user.token_version,
+            "fam": uuid.uuid4().hex,
+        },
+        expires_delta=refresh_token_expires,
     )
 
     return Token(
@@ -47,10 +97,19 @@ async def login_user(db: AsyncSession, username: str, password: str) -> Token:
     )
 
 
+def _family_expiry() -> datetime:
+    # A family revoked now must outlive every token already issued in it.
+    return datetime.now(timezone.utc) + timedelta(
+        minutes=CONFIG.REFRESH_TOKEN_EXPIRE_MINUTES
+    )
+
+
 async def refresh_access_token(db: AsyncSession, refresh_token: str) -> Token:
     payload = security.verify_refresh_token(refresh_token)
     username: str | None = payload.get("sub")
-    if not username:
+    jti: str | None = payload.get("jti")
+    family: str | None = payload.get("fam")
+    if not username or not jti or not family:
         raise InvalidTokenError("Invalid refresh token")
 
     user = await crud.get_user_by_username(db, username)
@@ -58,12 +117,42 @@ async def refresh_access_token(db: AsyncSession, refresh_token: str) -> Token:
         raise InvalidCredentialsError("User not found")
     if not user.is_active:
         raise InactiveUserError()
+    # The username may have been re-registered since this token was issued.
+    if payload.get("uid") != user.id or payload.get("ver") != user.token_version:
+        raise InvalidTokenError("Refresh token has been revoked")
+
+    # Refresh tokens are single-use. Presenting one that was already rotated
+    # means it leaked, so the whole family (including its successor) is revoked.
+    expires_at = datetime.fromtimestamp(payload["exp"], timezone.utc)
+    if not await revocation_store.consume(db, jti, family, expires_at):
+        await revocation_store.revoke_family(db, family, _family_expiry())
+        raise InvalidTokenError("Refresh token has been revoked")
 
     access_token_expires = timedelta(minutes=CONFIG.ACCESS_TOKEN_EXPIRE_MINUTES)
+    refresh_token_expires = timedelta(minutes=CONFIG.REFRESH_TOKEN_EXPIRE_MINUTES)
     new_access_token = security.create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data=_access_claims(user), expires_delta=access_token_expires
+    )
+    new_refresh_token = security.create_refresh_token(
+        data={
+            "sub": user.username,
+            "uid": user.id,
+            "ver": user.token_version,
+            "fam": family,
+        },
+        expires_delta=refresh_token_expires,
     )
 
     return Token(
-        access_token=new_access_token, refresh_token=refresh_token, token_type="bearer"
+        access_token=new_access_token,
+        refresh_token=new_refresh_token,
+        token_type="bearer",
     )
+
+
+async def logout_user(db: AsyncSession, refresh_token: str) -> None:
+    payload = security.verify_refresh_token(refresh_token)
+    family: str | None = payload.get("fam")
+    if not family:
+        raise InvalidTokenError("Invalid refresh token")
+    await revocation_store.revoke_family(db, family, _family_expiry())
@@ -0,0 +1,207 @@
+import codecs
+import csv
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import CONFIG
+from app.core.exceptions import ServiceOverloadedError
+from app.core.security import hash_passwords_async
+from app.db import crud
+from app.schemas.user import UserCreate, UserImportReport, UserImportRowError
+
+SUPPORTED_FORMATS = ("ndjson", "csv")
+
+
+class _OverlongLine(str):
+    """Stands in for a line over the length limit; its text is discarded."""
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes], max_length: int | None = None
+) -> AsyncIterator[str]:
+    """Split a streamed UTF-8 body into lines without buffering the whole body.
+
+    A line longer than ``max_length`` characters is never buffered in full: it
+    is skipped up to its newline and yielded as a single failing record.
+    """
+    max_length = max_length or CONFIG.BULK_IMPORT_MAX_LINE_LENGTH
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    skipping = False  # dropping the rest of an overlong line
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            if skipping:
+                skipping = False
+            elif len(line) > max_length:
+                yield _OverlongLine()
+            else:
+                yield line.rstrip("\r")
+        if len(pending) > max_length:
+            if not skipping:
+                yield _OverlongLine()
+            skipping = True
+            pending = ""
+    pending += decoder.decode(b"", final=True)
+    if pending and not skipping:
+        yield _OverlongLine() if len(pending) > max_length else pending.rstrip("\r")
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+async def _iter_records(
+    lines: AsyncIterable[str], fmt: str
+) -> AsyncIterator[tuple[int, dict | str]]:
+    """Yield (line number, record) pairs; unparseable lines yield an error string."""
+    header: list[str] | None = None
+    line_no = 0
+    # Physical lines of a CSV record whose quoted field spans a line break.
+    pending: list[str] = []
+    quotes = 0
+    async for line in lines:
+        line_no += 1
+        if isinstance(line, _OverlongLine):
+            # Also ends a CSV record in progress: it cannot be parsed anyway.
+            yield line_no - len(pending), "Line exceeds the maximum length"
+            pending, quotes = [], 0
+            continue
+        if not pending and not line.strip():
+            continue
+        if fmt == "csv":
+            pending.append(line)
+            quotes += line.count('"')
+            if quotes % 2:
+                continue  # still inside a quoted field
+            record_no = line_no - len(pending) + 1
+            values = next(csv.reader(["\n".join(pending)]))
+            pending, quotes = [], 0
+            if header is None:
+                header = [name.strip() for name in values]
+                continue
+            if len(values) != len(header):
+                yield record_no, f"Expected {len(header)} columns, got {len(values)}"
+                continue
+            yield record_no, dict(zip(header, values))
+        else:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield line_no, f"Invalid JSON: {exc.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_no, "Each line must be a JSON object"
+                continue
+            yield line_no, record
+    if pending:
+        yield line_no - len(pending) + 1, "Unterminated quoted field"
+
+
+class _ImportRun:
+    def __init__(self, db: AsyncSession, batch_size: int, max_errors: int):
+        self.db = db
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.report = UserImportReport()
+        self.batch: list[tuple[int, UserCreate]] = []
+
+    def fail(self, line: int, detail: str, username: str | None = None) -> None:
+        self.report.failed += 1
+        if len(self.report.errors) < self.max_errors:
+            self.report.errors.append(
+                UserImportRowError(line=line, username=username, detail=detail)
+            )
+
+    async def add(self, line: int, user: UserCreate) -> None:
+        self.batch.append((line, user))
+        if len(self.batch) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self.batch:
+            return
+        batch, self.batch = self.batch, []
+        try:
+            await self._insert(batch)
+        except (ServiceOverloadedError, SQLAlchemyError) as exc:
+            # Keep what earlier batches committed and report where it stopped.
+            await self.db.rollback()
+            reason = getattr(exc, "message", None) or type(exc).__name__
+            self.report.aborted = reason
+            for line, user in batch:
+                self.fail(line, f"Not imported: {reason}", user.username)
+
+    async def _insert(self, batch: list[tuple[int, UserCreate]]) -> None:
+        hashes = await hash_passwords_async(
+            [user.password for _, user in batch],
+            concurrency=CONFIG.BULK_IMPORT_HASH_CONCURRENCY or None,
+            max_wait=CONFIG.BULK_IMPORT_HASH_MAX_WAIT_SECONDS,
+        )
+        rows = [
+            {
+                "username": user.username,
+                "email": user.email,
+                "hashed_password": hashed,
+                "role": "user",
+                "is_active": True,
+            }
+            for (_, user), hashed in zip(batch, hashes)
+        ]
+        inserted = await crud.bulk_insert_users(self.db, rows)
+        for line, user in batch:
+            # Credit the row that was actually written: rows sharing a username
+            # differ in email, and exact duplicates are credited only once.
+            if (user.username, user.email) in inserted:
+                inserted.discard((user.username, user.email))
+                self.report.imported += 1
+            else:
+                self.fail(line, "Username or email already exists", user.username)
+
+
+async def import_users(
+    db: AsyncSession,
+    lines: AsyncIterable[str],
+    fmt: str = "ndjson",
+    batch_size: int | None = None,
+) -> UserImportReport:
+    """Validate, hash and insert users from NDJSON or CSV lines in batches.
+
+    Rows are validated with ``UserCreate``; each batch is committed on its own,
+    so a failure part-way through keeps the batches already written. If the
+    hashing pool stays saturated or the database fails, the import stops and
+    the report says why (``aborted``), listing the batch that was not written.
+    """
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported import format: {fmt!r}")
+
+    run = _ImportRun(
+        db,
+        batch_size=batch_size or CONFIG.BULK_IMPORT_BATCH_SIZE,
+        max_errors=CONFIG.BULK_IMPORT_MAX_ERRORS,
+    )
+    async for line, record in _iter_records(lines, fmt):
+        run.report.total += 1
+        if isinstance(record, str):
+            run.fail(line, record)
+            continue
+        username = record.get("username")
+        username = str(username) if username is not None else None
+        try:
+            user = UserCreate.model_validate(record)
+        except ValidationError as exc:
+            run.fail(line, _format_validation_error(exc), username)
+            continue
+        await run.add(line, user)
+        if run.report.aborted:
+            return run.report
+    await run.flush()
+    return run.report
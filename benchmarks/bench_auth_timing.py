@@ -0,0 +1,118 @@
+"""Benchmark: latency and CPU cost of failed logins, known vs. unknown usernames.
+
+Runs ``crud.authenticate_user`` against the configured database (see
+``benchmarks.load_test`` for pointing it at a disposable instance) for:
+
+- ``known``: an existing user with a wrong password (real pbkdf2 verify)
+- ``unknown``: nonexistent usernames (negative cache + calibrated sleep)
+- ``naive``: nonexistent usernames answered by verifying a dummy hash
+
+and prints p50/p95/p99 latency plus CPU milliseconds per attempt, so the
+``unknown`` distribution can be checked against ``known`` while costing
+about as little CPU as a cache lookup.
+
+Usage:
+    python -m benchmarks.bench_auth_timing [--attempts 300] [--concurrency 4]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+import uuid
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-benchmark-secret-key")
+
+from sqlalchemy import delete  # noqa: E402
+
+from app.core import security  # noqa: E402
+from app.db import crud  # noqa: E402
+from app.db.connection import AsyncSessionLocal, dispose_engines, init_engines  # noqa: E402
+from app.db.models.models import User  # noqa: E402
+
+
+async def _run(attempt, attempts: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    queue = iter(range(attempts))
+
+    async def worker() -> None:
+        async with AsyncSessionLocal() as db:
+            for i in queue:
+                start = time.perf_counter()
+                await attempt(db, i)
+                latencies.append(time.perf_counter() - start)
+
+    cpu_start = time.process_time()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    cpu = time.process_time() - cpu_start
+
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "p50_ms": quantiles[49] * 1000,
+        "p95_ms": quantiles[94] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+        "cpu_ms": cpu / attempts * 1000,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    username = f"timing{uuid.uuid4().hex[:8]}"
+    init_engines()
+    async with AsyncSessionLocal() as db:
+        await crud.bulk_insert_users(
+            db,
+            [
+                {
+                    "username": username,
+                    "email": f"{username}@bench.example.com",
+                    "hashed_password": security.get_password_hash("Bench1234"),
+                    "role": "user",
+                    "is_active": True,
+                }
+            ],
+        )
+    dummy_hash = security.get_password_hash("dummy")
+
+    async def known(db, i: int) -> None:
+        await crud.authenticate_user(db, username, "Wrong1234")
+
+    async def unknown(db, i: int) -> None:
+        # A small pool of names, as in a credential-stuffing list.
+        await crud.authenticate_user(db, f"ghost{i % 50}", "Wrong1234")
+
+    async def naive(db, i: int) -> None:
+        await crud.get_user_by_username(db, f"ghost{i % 50}")
+        await security.verify_password_async("Wrong1234", dummy_hash)
+
+    try:
+        # Warm up the pool and collect real-latency samples for calibration.
+        await _run(known, 50, args.concurrency)
+        results = {
+            name: await _run(attempt, args.attempts, args.concurrency)
+            for name, attempt in (
+                ("known", known),
+                ("unknown", unknown),
+                ("naive", naive),
+            )
+        }
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(User).where(User.username == username))
+            await db.commit()
+        security.hashing_pool.shutdown()
+        await dispose_engines()
+
+    print(f"{'branch':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'cpu ms':>9}")
+    for name, summary in results.items():
+        print(
+            f"{name:>8} {summary['p50_ms']:9.2f} {summary['p95_ms']:9.2f} "
+            f"{summary['p99_ms']:9.2f} {summary['cpu_ms']:9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--attempts", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=4)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,119 @@
+"""Benchmark: per-request CPU of FastAPI's default JSON path vs. the fast path.
+
+Serves the same ``UserResponse`` / ``Token`` / panel payloads from a throwaway
+app twice, once the default way (``response_model`` + ``JSONResponse``) and
+once through ``ModelResponse`` / ``FastJSONResponse``, and reports CPU
+microseconds per request, calling the ASGI app directly so client overhead
+does not drown the difference (best of ``--rounds``).
+
+Usage:
+    python -m benchmarks.bench_json_response [--requests 5000]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from app.core import responses
+from app.core.responses import FastJSONResponse, ModelResponse
+from app.schemas.user import Token, UserResponse, UserRole
+
+USER = UserResponse(
+    id=42,
+    username="benchmark_user",
+    email="benchmark@example.com",
+    role=UserRole.USER,
+    is_active=True,
+    created_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+    updated_at=datetime(2026, 1, 2, tzinfo=timezone.utc),
+)
+TOKEN = Token(access_token="a" * 300, refresh_token="r" * 300, token_type="bearer")
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/default/user", response_model=UserResponse)
+    async def default_user():
+        return USER
+
+    @app.get("/fast/user", response_model=UserResponse)
+    async def fast_user():
+        return ModelResponse(USER)
+
+    @app.get("/default/token", response_model=Token)
+    async def default_token():
+        return TOKEN
+
+    @app.get("/fast/token", response_model=Token)
+    async def fast_token():
+        return ModelResponse(TOKEN)
+
+    def panel() -> dict:
+        return {"message": "Welcome!", "role": UserRole.ADMIN, "access_level": "all"}
+
+    @app.get("/default/panel", response_class=JSONResponse)
+    async def default_panel():
+        return panel()
+
+    @app.get("/fast/panel")
+    async def fast_panel():
+        return FastJSONResponse(panel())
+
+    return app
+
+
+async def _receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message: dict) -> None:
+    pass
+
+
+async def _cpu_per_request(app: FastAPI, path: str, n: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    start = time.process_time()
+    for _ in range(n):
+        await app(dict(scope), _receive, _send)
+    return (time.process_time() - start) / n * 1e6
+
+
+async def main(args: argparse.Namespace) -> None:
+    app = build_app()
+    print(f"JSON encoder: {'orjson' if responses.orjson else 'stdlib json'}")
+    print(f"{'payload':>8} {'default us':>11} {'fast us':>9} {'saved':>7}")
+    for payload in ("user", "token", "panel"):
+        paths = (f"/default/{payload}", f"/fast/{payload}")
+        best = {path: float("inf") for path in paths}
+        for _ in range(args.rounds):
+            for path in paths:
+                cpu = await _cpu_per_request(app, path, args.requests)
+                best[path] = min(best[path], cpu)
+        default, fast = best[paths[0]], best[paths[1]]
+        saved = (default - fast) / default * 100
+        print(f"{payload:>8} {default:11.1f} {fast:9.1f} {saved:6.1f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
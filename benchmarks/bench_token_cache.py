@@ -0,0 +1,44 @@
+"""Microbenchmark: cold vs. cached access-token verification.
+
+Usage:
+    python -m benchmarks.bench_token_cache [--iterations 20000]
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-benchmark-secret-key")
+
+from app.core import security  # noqa: E402
+from app.core.config import CONFIG  # noqa: E402
+
+
+def _throughput(iterations: int, token: str) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        security.verify_access_token(token)
+    return iterations / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    token = security.create_access_token({"sub": "benchmark"})
+
+    CONFIG.TOKEN_CACHE_ENABLED = False
+    cold = _throughput(args.iterations, token)
+
+    CONFIG.TOKEN_CACHE_ENABLED = True
+    security.token_cache.clear()
+    cached = _throughput(args.iterations, token)
+
+    print(f"cold jwt.decode : {cold:12,.0f} verifications/s")
+    print(f"cached          : {cached:12,.0f} verifications/s")
+    print(f"speedup         : {cached / cold:12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
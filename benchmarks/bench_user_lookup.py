@@ -0,0 +1,96 @@
+"""Benchmark: app-side CPU per user lookup, rebuilt select() vs. cached forms.
+
+Compares, against a real database, the per-call ``select(User)`` construct the
+lookups used to build, the cached lambda statement returning a ``User`` and the
+lambda statement returning a plain principal row. Reports process CPU (the
+database server's time is not included) and wall time per lookup, best of
+``--rounds``. One user is inserted in a transaction that is rolled back.
+
+The database is the one configured for the app (POSTGRES_*), e.g.:
+
+    POSTGRES_HOST=localhost POSTGRES_PORT=5433 POSTGRES_USER=test_user \\
+    POSTGRES_PASSWORD=test_password POSTGRES_DB=test_db \\
+    python -m benchmarks.bench_user_lookup [--lookups 5000]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-benchmark-secret-key")
+
+from sqlalchemy.future import select  # noqa: E402
+
+from app.db import crud  # noqa: E402
+from app.db.connection import AsyncSessionLocal, dispose_engines, init_engines  # noqa: E402
+from app.db.models.models import User  # noqa: E402
+
+USERNAME = "Lookup_Benchmark"
+
+
+async def rebuilt_select(db, username: str):
+    stmt = select(User).where(crud._username_is(username), crud._live)
+    return (await db.execute(stmt)).scalar_one_or_none()
+
+
+VARIANTS = {
+    "select() + ORM User": rebuilt_select,
+    "lambda_stmt + ORM User": crud.get_user_by_username,
+    "lambda_stmt + row": crud.get_principal_row,
+}
+
+
+async def _measure(db, lookup, lookups: int) -> tuple[float, float]:
+    cpu, wall = time.process_time(), time.perf_counter()
+    for _ in range(lookups):
+        assert await lookup(db, USERNAME.lower()) is not None
+        # Drop identity-map state so every ORM lookup hydrates afresh.
+        db.expunge_all()
+    return (
+        (time.process_time() - cpu) / lookups * 1e6,
+        (time.perf_counter() - wall) / lookups * 1e6,
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    init_engines()
+    try:
+        async with AsyncSessionLocal() as db:
+            db.add(
+                User(
+                    username=USERNAME,
+                    email="lookup.benchmark@example.com",
+                    hashed_password="x",
+                    role="user",
+                    is_active=True,
+                )
+            )
+            await db.flush()
+
+            results: dict[str, tuple[float, float]] = {}
+            for name, lookup in VARIANTS.items():
+                await _measure(db, lookup, 200)  # warm caches and prepare
+                results[name] = min(
+                    [
+                        await _measure(db, lookup, args.lookups)
+                        for _ in range(args.rounds)
+                    ]
+                )
+            await db.rollback()
+    finally:
+        await dispose_engines()
+
+    baseline = results["select() + ORM User"][0]
+    for name, (cpu_us, wall_us) in results.items():
+        print(
+            f"{name:>24}: {cpu_us:8.1f} us CPU  {wall_us:8.1f} us wall  "
+            f"({baseline - cpu_us:+6.1f} us CPU saved)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lookups", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))
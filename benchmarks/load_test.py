@@ -0,0 +1,349 @@
+"""Load-test harness for the auth and user endpoints.
+
+Drives ``app.main.app`` in-process through ``httpx.ASGITransport`` (default) or a
+running server (``--url``), seeds a population of users straight into Postgres
+and reports p50/p95/p99 latency and throughput per scenario as JSON, so runs can
+be diffed between commits.
+
+The database is the one configured for the app (POSTGRES_* / POSTGRES_HOST /
+POSTGRES_PORT); point it at a disposable instance such as the ``test_db``
+compose service:
+
+    POSTGRES_HOST=localhost POSTGRES_PORT=5433 \\
+    POSTGRES_USER=test_user POSTGRES_PASSWORD=test_password POSTGRES_DB=test_db \\
+    uv run python -m benchmarks.load_test --users 10000 --requests 2000 \\
+        --concurrency 32 --output bench_output.json
+
+Login rate limits are switched off for in-process runs; start a server under
+test with ``RATE_LIMIT_ENABLED=false`` when using ``--url``.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+import uuid
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+import httpx
+from sqlalchemy import delete
+
+from app.core.security import get_password_hash
+from app.db import crud
+from app.db.connection import AsyncSessionLocal, dispose_engines, init_engines
+from app.db.models.models import User
+
+PASSWORD = "Bench1234"
+SCENARIOS = (
+    "register",
+    "login",
+    "refresh",
+    "me_get",
+    "me_patch",
+    "admin_panel",
+    "moderator_panel",
+)
+
+
+@dataclass
+class ScenarioResult:
+    latencies: list[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    wall_time: float = 0.0
+
+    def summary(self) -> dict:
+        count = len(self.latencies)
+        ordered = sorted(self.latencies)
+        percentiles = (
+            statistics.quantiles(ordered, n=100, method="inclusive")
+            if count > 1
+            else ordered * 99
+        )
+        ok = sum(n for status, n in self.statuses.items() if status < 400)
+        return {
+            "requests": count,
+            "errors": count - ok,
+            "statuses": {str(status): n for status, n in sorted(self.statuses.items())},
+            "req_per_s": round(count / self.wall_time, 2) if self.wall_time else 0.0,
+            "mean_ms": round(statistics.fmean(ordered) * 1000, 3) if count else None,
+            "p50_ms": round(percentiles[49] * 1000, 3) if count else None,
+            "p95_ms": round(percentiles[94] * 1000, 3) if count else None,
+            "p99_ms": round(percentiles[98] * 1000, 3) if count else None,
+            "max_ms": round(ordered[-1] * 1000, 3) if count else None,
+        }
+
+
+@dataclass
+class Session:
+    username: str
+    access_token: str
+    refresh_token: str
+
+
+async def seed_users(prefix: str, count: int) -> None:
+    """Insert ``count`` users plus one admin and one moderator in batches."""
+    hashed = get_password_hash(PASSWORD)
+
+    def row(name: str, role: str) -> dict:
+        return {
+            "username": name,
+            "email": f"{name}@bench.example.com",
+            "hashed_password": hashed,
+            "role": role,
+            "is_active": True,
+        }
+
+    rows = [row(f"{prefix}_admin", "admin"), row(f"{prefix}_mod", "moderator")]
+    rows.extend(row(f"{prefix}_{i}", "user") for i in range(count))
+    async with AsyncSessionLocal() as db:
+        for start in range(0, len(rows), 1000):
+            await crud.bulk_insert_users(db, rows[start : start + 1000])
+
+
+async def remove_users(prefix: str) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(User).where(User.username.like(f"{prefix}\\_%")))
+        await db.commit()
+
+
+async def login(client: httpx.AsyncClient, username: str) -> Session:
+    response = await client.post(
+        "/api/v1/auth/login", data={"username": username, "password": PASSWORD}
+    )
+    response.raise_for_status()
+    tokens = response.json()
+    return Session(username, tokens["access_token"], tokens["refresh_token"])
+
+
+def _auth(session: Session) -> dict:
+    return {"Authorization": f"Bearer {session.access_token}"}
+
+
+def build_scenarios(
+    client: httpx.AsyncClient,
+    prefix: str,
+    population: int,
+    users: list[Session],
+    admin: Session,
+    moderator: Session,
+) -> dict[str, Callable[[int], Awaitable[httpx.Response]]]:
+    sessions = itertools.cycle(users)
+    registrations = itertools.count()
+    # Refresh tokens are single-use: two workers refreshing the same session at
+    # once would look like token reuse and revoke its whole family.
+    idle_sessions: asyncio.Queue[Session] = asyncio.Queue()
+    for session in users:
+        idle_sessions.put_nowait(session)
+
+    async def register(i: int) -> httpx.Response:
+        name = f"{prefix}_new{next(registrations)}"
+        return await client.post(
+            "/api/v1/auth/register",
+            json={
+                "username": name,
+                "email": f"{name}@bench.example.com",
+                "password": PASSWORD,
+            },
+        )
+
+    async def login_(i: int) -> httpx.Response:
+        return await client.post(
+            "/api/v1/auth/login",
+            data={
+                "username": f"{prefix}_{random.randrange(population)}",
+                "password": PASSWORD,
+            },
+        )
+
+    async def refresh(i: int) -> httpx.Response:
+        session = await idle_sessions.get()
+        try:
+            response = await client.post(
+                "/api/v1/auth/refresh", json={"refresh_token": session.refresh_token}
+            )
+            if response.status_code == 200:
+                # Keep the newest token in case the server rotates refresh tokens.
+                session.refresh_token = response.json()["refresh_token"]
+            return response
+        finally:
+            idle_sessions.put_nowait(session)
+
+    async def me_get(i: int) -> httpx.Response:
+        return await client.get("/api/v1/users/me", headers=_auth(next(sessions)))
+
+    async def me_patch(i: int) -> httpx.Response:
+        return await client.patch(
+            "/api/v1/users/me", headers=_auth(next(sessions)), json={"is_active": True}
+        )
+
+    async def admin_panel(i: int) -> httpx.Response:
+        return await client.get("/api/v1/admin/admin-dashboard", headers=_auth(admin))
+
+    async def moderator_panel(i: int) -> httpx.Response:
+        return await client.get(
+            "/api/v1/moderator/moderator-panel", headers=_auth(moderator)
+        )
+
+    return {
+        "register": register,
+        "login": login_,
+        "refresh": refresh,
+        "me_get": me_get,
+        "me_patch": me_patch,
+        "admin_panel": admin_panel,
+        "moderator_panel": moderator_panel,
+    }
+
+
+async def run_scenario(
+    call: Callable[[int], Awaitable[httpx.Response]], requests: int, concurrency: int
+) -> ScenarioResult:
+    result = ScenarioResult()
+    counter = itertools.count()
+
+    async def worker() -> None:
+        while (i := next(counter)) < requests:
+            start = time.perf_counter()
+            try:
+                response = await call(i)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 599
+            result.latencies.append(time.perf_counter() - start)
+            result.statuses[status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.wall_time = time.perf_counter() - started
+    return result
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args: argparse.Namespace) -> dict:
+    prefix = f"bench{uuid.uuid4().hex[:8]}"
+    init_engines()
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+    else:
+        from app.core.rate_limit import rate_limiter
+        from app.main import app
+
+        # Every simulated client shares one address and a few usernames.
+        rate_limiter.enabled = False
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://bench",
+            timeout=args.timeout,
+        )
+
+    report: dict = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "target": args.url or "in-process",
+        "population": args.users,
+        "requests_per_scenario": args.requests,
+        "concurrency": args.concurrency,
+        "scenarios": {},
+    }
+
+    print(f"Seeding {args.users} users ({prefix}_*)...")
+    await seed_users(prefix, args.users)
+    try:
+        async with client:
+            sample = random.sample(range(args.users), min(args.sessions, args.users))
+            users = [await login(client, f"{prefix}_{i}") for i in sample]
+            admin = await login(client, f"{prefix}_admin")
+            moderator = await login(client, f"{prefix}_mod")
+            scenarios = build_scenarios(
+                client, prefix, args.users, users, admin, moderator
+            )
+
+            for name in args.scenarios:
+                if args.warmup:
+                    await run_scenario(
+                        scenarios[name], args.warmup, min(args.concurrency, args.warmup)
+                    )
+                result = await run_scenario(
+                    scenarios[name], args.requests, args.concurrency
+                )
+                report["scenarios"][name] = summary = result.summary()
+                print(
+                    f"{name:>16}: {summary['req_per_s']:>9} req/s  "
+                    f"p50 {summary['p50_ms']} ms  p95 {summary['p95_ms']} ms  "
+                    f"p99 {summary['p99_ms']} ms  errors {summary['errors']}"
+                )
+    finally:
+        if not args.keep_users:
+            await remove_users(prefix)
+        await dispose_engines()
+    return report
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--url", help="Base URL of a running server (default: in-process)"
+    )
+    parser.add_argument(
+        "--users", type=int, default=1000, help="Seeded population size"
+    )
+    parser.add_argument(
+        "--sessions", type=int, default=50, help="Users logged in up front"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=500, help="Requests per scenario"
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--warmup", type=int, default=20, help="Unmeasured requests first"
+    )
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=SCENARIOS,
+        default=list(SCENARIOS),
+        metavar="SCENARIO",
+        help=f"Subset of: {', '.join(SCENARIOS)}",
+    )
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument(
+        "--keep-users",
+        action="store_true",
+        help="Do not delete seeded users afterwards",
+    )
+    args = parser.parse_args(argv)
+    if "refresh" in args.scenarios and min(args.sessions, args.users) < (
+        args.concurrency
+    ):
+        # Each in-flight refresh holds its session exclusively; with fewer
+        # sessions than workers the extra workers would only measure waiting.
+        parser.error(
+            "the refresh scenario needs --sessions (and --users) >= --concurrency"
+        )
+    return args
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    results = asyncio.run(main(arguments))
+    with open(arguments.output, "w", encoding="utf-8") as handle:
+        json.dump(results, handle, indent=2)
+    print(f"Wrote {arguments.output}")
@@ -0,0 +1,131 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from app.core.security import get_password_hash
+from app.db.models.models import User
+
+
+@pytest_asyncio.fixture
+async def many_users(db_session):
+    hashed = get_password_hash("Test1234")
+    users = [
+        User(
+            username=f"member{i}",
+            email=f"member{i}@example.com",
+            hashed_password=hashed,
+            role="user",
+            is_active=i % 2 == 0,
+        )
+        for i in range(5)
+    ]
+    db_session.add_all(users)
+    await db_session.flush()
+    return users
+
+
+@pytest.mark.asyncio
+async def test_keyset_pagination_visits_every_user_once(
+    client: AsyncClient, admin_token, many_users
+):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = await client.get(
+            "/api/v1/admin/users", headers=headers, params=params
+        )
+        assert response.status_code == 200
+        page = response.json()
+        assert isinstance(page["approximate_total"], int)
+        seen.extend(user["username"] for user in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen)) == 6  # 5 members + the admin
+
+
+@pytest.mark.asyncio
+async def test_list_users_filters(client: AsyncClient, admin_token, many_users):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await client.get(
+        "/api/v1/admin/users",
+        headers=headers,
+        params={"is_active": "false", "username_prefix": "member"},
+    )
+    assert response.status_code == 200
+    assert sorted(user["username"] for user in response.json()["items"]) == [
+        "member1",
+        "member3",
+    ]
+
+    response = await client.get(
+        "/api/v1/admin/users", headers=headers, params={"role": "admin"}
+    )
+    assert [user["username"] for user in response.json()["items"]] == ["adminuser"]
+
+
+@pytest.mark.asyncio
+async def test_list_users_prefix_filters_ignore_case(
+    client: AsyncClient, admin_token, many_users
+):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    for params in ({"username_prefix": "MEMBER"}, {"email_prefix": "Member"}):
+        response = await client.get(
+            "/api/v1/admin/users", headers=headers, params=params
+        )
+        assert response.status_code == 200
+        assert len(response.json()["items"]) == 5
+
+
+@pytest.mark.asyncio
+async def test_list_users_rejects_bad_cursor(client: AsyncClient, admin_token):
+    response = await client.get(
+        "/api/v1/admin/users",
+        headers={"Authorization": f"Bearer {admin_token}"},
+        params={"cursor": "not-a-cursor"},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_batch_update_changes_only_differing_rows(
+    client: AsyncClient, admin_token, many_users
+):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    ids = [user.id for user in many_users]
+    response = await client.patch(
+        "/api/v1/admin/users", headers=headers, json={"ids": ids, "is_active": False}
+    )
+    assert response.status_code == 200
+    # member1 and member3 are already inactive.
+    assert response.json() == {"updated": 3, "ids": sorted(ids[0::2])}
+
+    response = await client.patch(
+        "/api/v1/admin/users",
+        headers=headers,
+        json={"ids": ids[:2], "role": "moderator"},
+    )
+    assert response.json()["updated"] == 2
+
+    response = await client.get(
+        "/api/v1/admin/users",
+        headers=headers,
+        params={"role": "moderator", "is_active": "false"},
+    )
+    assert sorted(user["username"] for user in response.json()["items"]) == [
+        "member0",
+        "member1",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_update_requires_a_change(client: AsyncClient, admin_token):
+    response = await client.patch(
+        "/api/v1/admin/users",
+        headers={"Authorization": f"Bearer {admin_token}"},
+        json={"ids": [1]},
+    )
+    assert response.status_code == 422
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, insert, literal, select, text
+
+from app.db import crud
+from app.db.models.models import User
+from app.schemas.user import UserRole
+
+
+async def _register(client: AsyncClient, username: str, email: str):
+    return await client.post(
+        "/api/v1/auth/register",
+        json={"username": username, "email": email, "password": "Test1234"},
+    )
+
+
+@pytest.mark.asyncio
+async def test_username_and_email_ignore_case(client: AsyncClient):
+    assert (await _register(client, "Alice", "Alice@Example.com")).status_code == 201
+
+    response = await client.post(
+        "/api/v1/auth/login", data={"username": "ALICE", "password": "Test1234"}
+    )
+    assert response.status_code == 200
+    me = await client.get(
+        "/api/v1/users/me",
+        headers={"Authorization": f"Bearer {response.json()['access_token']}"},
+    )
+    assert me.json()["username"] == "Alice"  # stored as registered
+
+    # A conflict rolls back the test transaction, so it has to come last.
+    response = await _register(client, "alice", "other@example.com")
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Username already exists"
+
+
+@pytest.mark.asyncio
+async def test_email_conflict_ignores_case(client: AsyncClient):
+    assert (await _register(client, "bob", "Bob@Example.com")).status_code == 201
+    response = await _register(client, "other", "bob@example.COM")
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Email already exists"
+
+
+def _plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+@pytest.mark.asyncio
+async def test_login_lookup_uses_expression_index(db_session):
+    number = func.generate_series(1, 20000).column_valued("n")
+    await db_session.execute(
+        insert(User).from_select(
+            ["username", "email", "hashed_password", "role", "is_active"],
+            select(
+                literal("bulk") + number.cast(User.username.type),
+                literal("bulk") + number.cast(User.email.type) + "@example.com",
+                literal("x"),
+                literal(UserRole.USER, User.role.type),
+                literal(True),
+            ),
+        )
+    )
+    await db_session.execute(text("ANALYZE auth_users"))
+
+    stmt = select(User).where(crud._username_is("BULK12345"), crud._live)
+    plan = (await db_session.execute(crud._Explain(stmt))).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    index_names = {node.get("Index Name") for node in _plan_nodes(plan[0]["Plan"])}
+    assert "uq_auth_users_username_ci" in index_names
+
+    stmt = select(User).where(*crud._user_list_filters(username_prefix="BULK123"))
+    plan = (await db_session.execute(crud._Explain(stmt))).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    index_names = {node.get("Index Name") for node in _plan_nodes(plan[0]["Plan"])}
+    # Under the C collation the plain lower(username) index also serves LIKE.
+    assert index_names & {
+        "ix_auth_users_username_ci_pattern",
+        "uq_auth_users_username_ci",
+    }
@@ -0,0 +1,70 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.exceptions import HashingPoolSaturatedError
+from app.core.hashing import HashingPool
+from app.core.security import hash_password_async, verify_password_async
+
+
+@pytest.mark.asyncio
+async def test_async_hash_round_trip():
+    hashed = await hash_password_async("Test1234")
+    assert await verify_password_async("Test1234", hashed)
+    assert not await verify_password_async("Wrong1234", hashed)
+
+
+@pytest.mark.asyncio
+async def test_saturated_pool_rejects_fast():
+    """Calls beyond workers + queue must fail immediately instead of queueing"""
+    pool = HashingPool(kind="thread", max_workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        blocked = [
+            asyncio.create_task(pool.run("hash", release.wait)) for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        assert pool.pending == 2
+
+        with pytest.raises(HashingPoolSaturatedError):
+            await pool.run("hash", release.wait)
+
+        release.set()
+        await asyncio.gather(*blocked)
+        assert pool.pending == 0
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_keeps_capacity_until_job_finishes():
+    """A client timeout must not free a slot whose job is still running"""
+    pool = HashingPool(kind="thread", max_workers=1, max_queue=0)
+    started, release = threading.Event(), threading.Event()
+
+    def job():
+        started.set()
+        release.wait()
+
+    try:
+        caller = asyncio.create_task(pool.run("hash", job))
+        await asyncio.to_thread(started.wait)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        assert pool.pending == 1
+
+        with pytest.raises(HashingPoolSaturatedError):
+            await pool.run("hash", job)
+
+        release.set()
+        for _ in range(100):
+            if pool.pending == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert pool.pending == 0
+    finally:
+        release.set()
+        pool.shutdown()
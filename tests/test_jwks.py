@@ -0,0 +1,123 @@
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from app.core import security
+from app.core.config import CONFIG
+from app.core.exceptions import InvalidTokenError
+from app.core.keys import KeyRing, add_key_to_manifest, load_key_ring
+
+
+@pytest_asyncio.fixture
+async def key_ring(tmp_path, monkeypatch):
+    manifest = tmp_path / "keys.json"
+    now = datetime.now(timezone.utc)
+    add_key_to_manifest(manifest, "current", "EdDSA", now - timedelta(days=1))
+    add_key_to_manifest(manifest, "next", "ES256", now + timedelta(days=1))
+    ring = load_key_ring(manifest)
+    monkeypatch.setattr(security, "key_ring", ring)
+    return ring
+
+
+@pytest.mark.asyncio
+async def test_tokens_are_signed_with_active_key(key_ring):
+    token = security.create_access_token({"sub": "testuser"})
+
+    header = jwt.get_unverified_header(token)
+    assert header["kid"] == "current"
+    assert header["alg"] == "EdDSA"
+    assert security.verify_access_token(token)["sub"] == "testuser"
+
+
+@pytest.mark.asyncio
+async def test_scheduled_key_takes_over_signing(key_ring):
+    later = datetime.now(timezone.utc) + timedelta(days=2)
+
+    assert key_ring.signing_key(later).kid == "next"
+
+
+@pytest.mark.asyncio
+async def test_jwks_publishes_all_keys_with_etag(client: AsyncClient, key_ring):
+    response = await client.get("/.well-known/jwks.json")
+
+    assert response.status_code == 200
+    assert {key["kid"] for key in response.json()["keys"]} == {"current", "next"}
+    assert response.headers["cache-control"].startswith("public, max-age=")
+
+    etag = response.headers["etag"]
+    cached = await client.get("/.well-known/jwks.json", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_jwks_verifies_tokens_locally(client: AsyncClient, key_ring):
+    token = security.create_access_token({"sub": "testuser"})
+    jwks = jwt.PyJWKSet.from_dict((await client.get("/.well-known/jwks.json")).json())
+
+    key = jwks[jwt.get_unverified_header(token)["kid"]]
+    assert jwt.decode(token, key.key, algorithms=[key.algorithm_name])["sub"] == (
+        "testuser"
+    )
+
+
+@pytest.mark.asyncio
+async def test_cached_token_is_rejected_once_its_key_retires(key_ring, monkeypatch):
+    token = security.create_access_token({"sub": "testuser"})
+    security.verify_access_token(token)
+
+    now = datetime.now(timezone.utc)
+    retired = replace(key_ring.verification_key("current"), not_after=now)
+    successor = replace(key_ring.verification_key("next"), not_before=now)
+    monkeypatch.setattr(security, "key_ring", KeyRing([retired, successor]))
+
+    with pytest.raises(InvalidTokenError):
+        security.verify_access_token(token)
+
+
+def _legacy_hs256_token() -> str:
+    expires = datetime.now(timezone.utc) + timedelta(minutes=5)
+    return jwt.encode(
+        {"sub": "testuser", "type": "access", "exp": expires},
+        CONFIG.SECRET_KEY,
+        algorithm="HS256",
+    )
+
+
+@pytest.mark.asyncio
+async def test_kid_less_token_is_rejected_with_a_key_ring(key_ring, monkeypatch):
+    monkeypatch.setattr(CONFIG, "ALGORITHM", "HS256")
+    monkeypatch.setattr(CONFIG, "ALLOW_LEGACY_HS256_TOKENS_UNTIL", None)
+
+    with pytest.raises(InvalidTokenError):
+        security.verify_access_token(_legacy_hs256_token())
+
+
+@pytest.mark.asyncio
+async def test_kid_less_token_is_accepted_until_the_legacy_deadline(
+    key_ring, monkeypatch
+):
+    monkeypatch.setattr(CONFIG, "ALGORITHM", "HS256")
+    now = datetime.now(timezone.utc)
+    monkeypatch.setattr(
+        CONFIG, "ALLOW_LEGACY_HS256_TOKENS_UNTIL", now + timedelta(minutes=1)
+    )
+    token = _legacy_hs256_token()
+    assert security.verify_access_token(token)["sub"] == "testuser"
+
+    # Also once cached: the deadline is checked on every verification.
+    monkeypatch.setattr(CONFIG, "ALLOW_LEGACY_HS256_TOKENS_UNTIL", now)
+    with pytest.raises(InvalidTokenError):
+        security.verify_access_token(token)
+
+
+def test_manifest_without_an_active_key_fails_to_load(tmp_path):
+    manifest = tmp_path / "keys.json"
+    future = datetime.now(timezone.utc) + timedelta(hours=24)
+    add_key_to_manifest(manifest, "future", "EdDSA", future)
+
+    with pytest.raises(ValueError, match="can sign"):
+        load_key_ring(manifest)
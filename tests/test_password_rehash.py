@@ -0,0 +1,51 @@
+import pytest
+from httpx import AsyncClient
+from passlib.context import CryptContext
+
+from app.core import security
+from app.db.models.models import User
+
+
+@pytest.mark.asyncio
+async def test_login_upgrades_outdated_hash(client: AsyncClient, db_session):
+    legacy_hash = CryptContext(schemes=["pbkdf2_sha256"]).hash("Legacy1234")
+    user = User(
+        username="legacy",
+        email="legacy@example.com",
+        hashed_password=legacy_hash,
+        role="user",
+        is_active=True,
+    )
+    db_session.add(user)
+    await db_session.flush()
+    assert security.password_needs_rehash(legacy_hash)
+
+    response = await client.post(
+        "/api/v1/auth/login", data={"username": "legacy", "password": "Legacy1234"}
+    )
+    assert response.status_code == 200
+
+    await db_session.refresh(user)
+    assert user.hashed_password != legacy_hash
+    assert not security.password_needs_rehash(user.hashed_password)
+    assert security.verify_password("Legacy1234", user.hashed_password)
+
+
+@pytest.mark.asyncio
+async def test_current_hash_is_left_alone(client: AsyncClient, db_session, test_user):
+    current_hash = test_user.hashed_password
+
+    response = await client.post(
+        "/api/v1/auth/login", data={"username": "testuser", "password": "Test1234"}
+    )
+    assert response.status_code == 200
+
+    await db_session.refresh(test_user)
+    assert test_user.hashed_password == current_hash
+
+
+def test_calibrated_rounds_scale_with_budget():
+    cheap = security.calibrate_rounds("pbkdf2_sha256", target_ms=5, samples=3)
+    costly = security.calibrate_rounds("pbkdf2_sha256", target_ms=50, samples=3)
+
+    assert 1 <= cheap < costly
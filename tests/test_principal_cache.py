@@ -0,0 +1,44 @@
+import pytest
+from httpx import AsyncClient
+
+from app.db import crud
+from app.db.crud import principal_cache
+from app.schemas.user import UserPrincipal
+
+
+@pytest.mark.asyncio
+async def test_role_check_served_from_cache(client: AsyncClient, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    first = await client.get("/api/v1/admin/admin-dashboard", headers=headers)
+    second = await client.get("/api/v1/admin/admin-dashboard", headers=headers)
+
+    assert first.status_code == second.status_code == 200
+    assert principal_cache.misses == 1
+    assert principal_cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_profile_update_invalidates_cache(client: AsyncClient, user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    await client.get("/api/v1/moderator/moderator-panel", headers=headers)
+    assert "testuser" in principal_cache
+
+    response = await client.patch(
+        "/api/v1/users/me", headers=headers, json={"is_active": False}
+    )
+    assert response.status_code == 200
+    assert "testuser" not in principal_cache
+
+    response = await client.get("/api/v1/moderator/moderator-panel", headers=headers)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "User account is inactive"
+
+
+@pytest.mark.asyncio
+async def test_principal_row_matches_orm_snapshot(db_session, test_user):
+    # Second call reuses the cached lambda statement with a new bound value.
+    assert await crud.get_principal_row(db_session, "nobody") is None
+    row = await crud.get_principal_row(db_session, "TestUser")
+
+    assert row == UserPrincipal.model_validate(test_user)
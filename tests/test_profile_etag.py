@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+import pytest
+from httpx import AsyncClient
+
+from app.api.v1.endpoints import users
+from app.core.etag import user_etag
+from app.db import crud
+
+
+@pytest.mark.asyncio
+async def test_matching_etag_returns_304_without_loading_user(
+    client: AsyncClient, user_token, monkeypatch
+):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    first = await client.get("/api/v1/users/me", headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    async def no_lookup(*args):
+        raise AssertionError("304 must be answered from the principal snapshot")
+
+    # The endpoint imports the name directly, so patch its reference too.
+    monkeypatch.setattr(crud, "get_user_by_username", no_lookup)
+    monkeypatch.setattr(users, "get_user_by_username", no_lookup)
+    cached = await client.get(
+        "/api/v1/users/me", headers={**headers, "If-None-Match": etag}
+    )
+
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+
+
+@pytest.mark.asyncio
+async def test_stale_etag_returns_profile(client: AsyncClient, test_user, user_token):
+    stale = user_etag(test_user.id, test_user.updated_at - timedelta(seconds=1))
+
+    response = await client.get(
+        "/api/v1/users/me",
+        headers={"Authorization": f"Bearer {user_token}", "If-None-Match": stale},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["username"] == "testuser"
+
+
+@pytest.mark.asyncio
+async def test_patch_with_if_match(client: AsyncClient, test_user, user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    current = user_etag(test_user.id, test_user.updated_at)
+    stale = user_etag(test_user.id, test_user.updated_at - timedelta(seconds=1))
+
+    rejected = await client.patch(
+        "/api/v1/users/me",
+        headers={**headers, "If-Match": stale},
+        json={"email": "stale@example.com"},
+    )
+    assert rejected.status_code == 412
+
+    accepted = await client.patch(
+        "/api/v1/users/me",
+        headers={**headers, "If-Match": current},
+        json={"email": "fresh@example.com"},
+    )
+    assert accepted.status_code == 200
+    assert accepted.json()["email"] == "fresh@example.com"
+    assert "etag" in accepted.headers
@@ -0,0 +1,57 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+
+from app.core.security import get_password_hash
+from app.db.models.models import User
+
+
+@pytest.mark.asyncio
+async def test_update_is_a_single_statement(
+    client: AsyncClient, db_session, user_token
+):
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    connection = (await db_session.connection()).sync_connection
+    event.listen(connection, "before_cursor_execute", record)
+    try:
+        response = await client.patch(
+            "/api/v1/users/me",
+            headers={"Authorization": f"Bearer {user_token}"},
+            json={"email": "renamed@example.com"},
+        )
+    finally:
+        event.remove(connection, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    assert response.json()["email"] == "renamed@example.com"
+    writes = [sql for sql in statements if "auth_users" in sql]
+    assert len(writes) == 2  # the user lookup, then UPDATE ... RETURNING
+    assert writes[-1].startswith("UPDATE auth_users") and "RETURNING" in writes[-1]
+
+
+@pytest.mark.asyncio
+async def test_update_to_taken_email_conflicts(
+    client: AsyncClient, db_session, user_token
+):
+    db_session.add(
+        User(
+            username="someoneelse",
+            email="taken@example.com",
+            hashed_password=get_password_hash("Test1234"),
+            role="user",
+            is_active=True,
+        )
+    )
+    await db_session.flush()
+
+    response = await client.patch(
+        "/api/v1/users/me",
+        headers={"Authorization": f"Bearer {user_token}"},
+        json={"email": "taken@example.com"},
+    )
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Email already exists"
@@ -0,0 +1,91 @@
+import pytest
+from httpx import AsyncClient
+
+from app.core.exceptions import RateLimitExceededError
+from app.core.rate_limit import (
+    Limit,
+    MemoryRateLimitBackend,
+    RateLimiter,
+    RedisRateLimitBackend,
+)
+from app.db import crud
+
+
+class FakeRedis:
+    """The subset of redis.asyncio.Redis used by RedisRateLimitBackend."""
+
+    def __init__(self):
+        self.data: dict[str, int] = {}
+        self.ttls: dict[str, int] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        value = self.data.get(key)
+        return str(value).encode() if value is not None else None
+
+    async def incr(self, key: str) -> int:
+        self.data[key] = self.data.get(key, 0) + 1
+        return self.data[key]
+
+    async def decr(self, key: str) -> int:
+        self.data[key] = self.data.get(key, 0) - 1
+        return self.data[key]
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        self.ttls[key] = seconds
+        return True
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "backend",
+    [MemoryRateLimitBackend(max_keys=100), RedisRateLimitBackend(FakeRedis())],
+    ids=["memory", "redis"],
+)
+async def test_limiter_rejects_over_limit(backend):
+    limiter = RateLimiter(backend)
+    limit = Limit("test", max_requests=3, window=60)
+
+    for _ in range(3):
+        await limiter.check(limit, "client")
+    with pytest.raises(RateLimitExceededError) as exc_info:
+        await limiter.check(limit, "client")
+
+    assert 1 <= exc_info.value.retry_after <= 120
+    await limiter.check(limit, "other-client")
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_is_bounded():
+    backend = MemoryRateLimitBackend(max_keys=2)
+    limit = Limit("test", max_requests=1, window=60)
+
+    for key in ("a", "b", "c"):
+        await backend.hit(key, limit)
+
+    assert len(backend._counters) == 2
+
+
+@pytest.mark.asyncio
+async def test_login_throttled_before_password_check(
+    client: AsyncClient, test_user, monkeypatch
+):
+    attempts = 0
+    authenticate_user = crud.authenticate_user
+
+    async def counting_authenticate(*args):
+        nonlocal attempts
+        attempts += 1
+        return await authenticate_user(*args)
+
+    monkeypatch.setattr(crud, "authenticate_user", counting_authenticate)
+
+    statuses = []
+    for _ in range(11):
+        response = await client.post(
+            "/api/v1/auth/login", data={"username": "testuser", "password": "Wrong123"}
+        )
+        statuses.append(response.status_code)
+
+    assert statuses == [401] * 10 + [429]
+    assert int(response.headers["retry-after"]) >= 1
+    assert attempts == 10
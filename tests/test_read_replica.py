@@ -0,0 +1,101 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from starlette.requests import Request
+
+from app.db import connection
+from app.db.connection import (
+    READ_YOUR_WRITES_COOKIE,
+    REPLICA_FALLBACKS,
+    ReplicaFallback,
+    build_replica_engine,
+    get_read_db,
+)
+from tests.conftest import TEST_DATABASE_URL
+
+DOWN_REPLICA_URL = TEST_DATABASE_URL.replace(":5433/", ":1/")
+
+
+async def _backend_pid(engine) -> int:
+    async with engine.connect() as conn:
+        return (await conn.execute(text("SELECT pg_backend_pid()"))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_reads_fall_back_to_primary_when_replica_is_down():
+    fallback = ReplicaFallback("localhost", 5433, retry_after=60, timeout=1)
+    replica = build_replica_engine(DOWN_REPLICA_URL, fallback)
+    before = REPLICA_FALLBACKS.value()
+    try:
+        assert await _backend_pid(replica)
+    finally:
+        await replica.dispose()
+
+    assert not fallback.replica_available
+    assert REPLICA_FALLBACKS.value() == before + 1
+
+
+@pytest.mark.asyncio
+async def test_fallback_connection_is_dropped_once_replica_may_be_back():
+    fallback = ReplicaFallback("localhost", 5433, retry_after=60, timeout=1)
+    replica = build_replica_engine(TEST_DATABASE_URL, fallback)
+    fallback.mark_failed()
+    try:
+        first = await _backend_pid(replica)
+        assert await _backend_pid(replica) == first  # pooled fallback reused
+
+        fallback.retry_after = 0
+        fallback.mark_failed()  # retry window over: replica is tried again
+        assert await _backend_pid(replica) != first
+    finally:
+        await replica.dispose()
+
+
+class _SessionFactory:
+    def __init__(self, name: str):
+        self.name = name
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    async def close(self):
+        return None
+
+
+def _request(cookies: dict[str, str]) -> Request:
+    cookie = "; ".join(f"{name}={value}" for name, value in cookies.items())
+    headers = [(b"cookie", cookie.encode())] if cookie else []
+    return Request({"type": "http", "headers": headers})
+
+
+async def _read_session_name(request: Request) -> str:
+    return (await anext(get_read_db(request))).name
+
+
+@pytest.mark.asyncio
+async def test_own_writes_pin_reads_to_primary(
+    client: AsyncClient, user_token, monkeypatch
+):
+    monkeypatch.setattr(connection, "AsyncSessionLocal", _SessionFactory("primary"))
+    monkeypatch.setattr(connection, "ReadSessionLocal", _SessionFactory("replica"))
+    monkeypatch.setattr(connection, "replica_engine", object())
+    assert await _read_session_name(_request({})) == "replica"
+
+    response = await client.patch(
+        "/api/v1/users/me",
+        headers={"Authorization": f"Bearer {user_token}"},
+        json={"email": "pinned@example.com"},
+    )
+    assert response.status_code == 200
+    pinned_until = response.cookies[READ_YOUR_WRITES_COOKIE]
+
+    request = _request({READ_YOUR_WRITES_COOKIE: pinned_until})
+    assert await _read_session_name(request) == "primary"
+    expired = _request({READ_YOUR_WRITES_COOKIE: "1"})
+    assert await _read_session_name(expired) == "replica"
@@ -0,0 +1,67 @@
+import jwt
+import pytest
+
+from app.core.config import CONFIG
+from app.db.revocation import revocation_store
+
+
+async def _login(client, test_user) -> dict:
+    response = await client.post(
+        "/api/v1/auth/login", data={"username": "testuser", "password": "Test1234"}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+async def _refresh(client, refresh_token: str):
+    return await client.post(
+        "/api/v1/auth/refresh", json={"refresh_token": refresh_token}
+    )
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_token(client, test_user):
+    tokens = await _login(client, test_user)
+
+    response = await _refresh(client, tokens["refresh_token"])
+    assert response.status_code == 200
+    rotated = response.json()["refresh_token"]
+    assert rotated != tokens["refresh_token"]
+
+    assert (await _refresh(client, rotated)).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_reused_refresh_token_revokes_family(client, test_user):
+    tokens = await _login(client, test_user)
+    rotated = (await _refresh(client, tokens["refresh_token"])).json()["refresh_token"]
+    # Another worker would not have the consumed id in its local set.
+    revocation_store.clear_local()
+
+    reuse = await _refresh(client, tokens["refresh_token"])
+    assert reuse.status_code == 401
+
+    # The legitimate successor is revoked too, forcing a fresh login.
+    assert (await _refresh(client, rotated)).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_refresh_token(client, test_user):
+    tokens = await _login(client, test_user)
+
+    response = await client.post(
+        "/api/v1/auth/logout", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 204
+    assert (await _refresh(client, tokens["refresh_token"])).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_without_jti_is_rejected(client, test_user):
+    legacy = jwt.encode(
+        {"sub": "testuser", "type": "refresh", "exp": 9999999999},
+        CONFIG.SECRET_KEY,
+        algorithm=CONFIG.ALGORITHM,
+    )
+
+    assert (await _refresh(client, legacy)).status_code == 401
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import delete
+
+from app.db.connection import get_db
+from app.db.models.models import User
+from app.main import app
+from tests.conftest import TestingSessionLocal
+
+
+@pytest_asyncio.fixture
+async def committing_db():
+    """Give every request its own committing session so requests really race."""
+
+    async def get_committing_db():
+        async with TestingSessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = get_committing_db
+    yield
+    async with TestingSessionLocal() as session:
+        await session.execute(delete(User).where(User.username.like("racer%")))
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_register_duplicate_username(client: AsyncClient, test_user):
+    response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "testuser",
+            "email": "other@example.com",
+            "password": "Test1234",
+        },
+    )
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Username already exists"
+
+
+@pytest.mark.asyncio
+async def test_register_duplicate_email(client: AsyncClient, test_user):
+    response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "otheruser",
+            "email": "test@example.com",
+            "password": "Test1234",
+        },
+    )
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Email already exists"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicate_registrations(client: AsyncClient, committing_db):
+    """Only one of many simultaneous signups for the same account may succeed"""
+    responses = await asyncio.gather(
+        *(
+            client.post(
+                "/api/v1/auth/register",
+                json={
+                    "username": "racer",
+                    "email": f"racer{i}@example.com",
+                    "password": "Test1234",
+                },
+            )
+            for i in range(20)
+        )
+    )
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses.count(201) == 1
+    assert statuses.count(409) == 19
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.responses import FastJSONResponse, ModelResponse
+from app.schemas.user import Token, UserRole
+
+
+def test_model_response_matches_model_dump_json():
+    token = Token(access_token="a", refresh_token="r", token_type="bearer")
+
+    response = ModelResponse(token)
+
+    assert response.body == token.model_dump_json().encode()
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_fast_json_response_encodes_str_enums():
+    response = FastJSONResponse({"role": UserRole.ADMIN, "name": "Zoë"})
+
+    assert json.loads(response.body) == {"role": "admin", "name": "Zoë"}
+
+
+@pytest.mark.asyncio
+async def test_profile_served_through_model_response(client: AsyncClient, user_token):
+    response = await client.get(
+        "/api/v1/users/me", headers={"Authorization": f"Bearer {user_token}"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["username"] == "testuser"
+
+
+@pytest.mark.asyncio
+async def test_login_served_through_model_response(
+    client: AsyncClient, test_user, monkeypatch
+):
+    rendered = []
+    render = ModelResponse.render
+
+    def spy(self, content):
+        rendered.append(type(content))
+        return render(self, content)
+
+    monkeypatch.setattr(ModelResponse, "render", spy)
+    response = await client.post(
+        "/api/v1/auth/login", data={"username": "testuser", "password": "Test1234"}
+    )
+
+    assert response.status_code == 200
+    assert rendered == [Token]
+    assert set(response.json()) == {"access_token", "refresh_token", "token_type"}
@@ -0,0 +1,165 @@
+import asyncio
+from time import time
+
+import pytest
+from httpx import AsyncClient
+
+from app import main
+from app.core import security
+from app.core.config import CONFIG
+from app.core.health import DatabaseCheck, readiness
+from app.db import connection
+from tests.conftest import TEST_DATABASE_URL
+
+
+@pytest.mark.asyncio
+async def test_readyz_flips_after_warm_up(client: AsyncClient, monkeypatch):
+    warmed = []
+
+    async def fake_warm_pool(db_engine, connections):
+        warmed.append(connections)
+        return connections
+
+    async def fake_ping(db_engine, timeout):
+        return 0.002
+
+    monkeypatch.setattr(connection, "init_engines", lambda: None)
+    monkeypatch.setattr(connection, "ping", fake_ping)
+    monkeypatch.setattr(connection, "warm_pool", fake_warm_pool)
+    readiness.reset()
+    try:
+        assert (await client.get("/readyz")).status_code == 503
+
+        await main.warm_up()
+        await main.check_database()
+
+        response = await client.get("/readyz")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+        assert response.json()["database"]["latency_ms"] == 2.0
+        assert warmed == [CONFIG.DB_WARMUP_CONNECTIONS]
+    finally:
+        readiness.reset()
+
+
+@pytest.mark.asyncio
+async def test_failed_warm_up_is_reported_and_retried(client: AsyncClient, monkeypatch):
+    attempts = []
+    retrying = asyncio.Event()
+    resume = asyncio.Event()
+
+    async def flaky_security_warm_up():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("hash backend unavailable")
+        retrying.set()
+        await resume.wait()
+
+    async def fake_warm_pool(db_engine, connections):
+        return connections
+
+    monkeypatch.setattr(security, "warm_up", flaky_security_warm_up)
+    monkeypatch.setattr(CONFIG, "WARM_UP_RETRY_SECONDS", 0)
+    monkeypatch.setattr(connection, "init_engines", lambda: None)
+    monkeypatch.setattr(connection, "warm_pool", fake_warm_pool)
+    readiness.reset()
+    task = asyncio.create_task(main.warm_up())
+    try:
+        await retrying.wait()
+        response = await client.get("/readyz")
+        assert response.status_code == 503
+        assert response.json()["warm_up_error"] == (
+            "security: RuntimeError('hash backend unavailable')"
+        )
+
+        resume.set()
+        await task
+        assert readiness.warmed_up
+        assert readiness.warm_up_error is None
+        assert len(attempts) == 2
+    finally:
+        task.cancel()
+        readiness.reset()
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_leaves_connections_open():
+    db_engine = connection.build_engine(TEST_DATABASE_URL)
+    try:
+        opened = await connection.warm_pool(db_engine, 100)
+
+        assert opened == db_engine.pool.size()
+        assert db_engine.pool.checkedin() == opened
+    finally:
+        await db_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_healthz_is_always_ok(client: AsyncClient):
+    readiness.reset()
+    response = await client.get("/healthz")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_readyz_serves_failed_and_stale_database_checks(
+    client: AsyncClient, monkeypatch
+):
+    async def failing_ping(db_engine, timeout):
+        raise TimeoutError()
+
+    monkeypatch.setattr(connection, "ping", failing_ping)
+    readiness.reset()
+    readiness.mark_warmed_up(0.1)
+    try:
+        await main.check_database()
+        response = await client.get("/readyz")
+        assert response.status_code == 503
+        body = response.json()
+        assert body["status"] == "unavailable"
+        assert body["database"]["ok"] is False
+        assert body["database"]["error"] == "TimeoutError()"
+
+        readiness.database = DatabaseCheck(True, 0.001, time() - 3600)
+        assert (await client.get("/readyz")).status_code == 503
+    finally:
+        readiness.reset()
+
+
+@pytest.mark.asyncio
+async def test_ping_and_pool_status():
+    db_engine = connection.build_engine(TEST_DATABASE_URL)
+    try:
+        assert await connection.ping(db_engine, timeout=5) > 0
+
+        async with db_engine.connect():
+            status = connection.pool_status(db_engine)
+        assert status["checked_out"] == 1
+        assert status["saturation"] == round(
+            1 / (CONFIG.DB_POOL_SIZE + CONFIG.DB_MAX_OVERFLOW), 3
+        )
+    finally:
+        await db_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_busy_app_pool_does_not_fail_the_database_check(monkeypatch):
+    app_engine = connection.build_engine(
+        TEST_DATABASE_URL, pool_size=1, max_overflow=0, pool_timeout=30
+    )
+    health_engine = connection.build_engine(
+        TEST_DATABASE_URL, pool_size=1, max_overflow=0
+    )
+    monkeypatch.setattr(connection, "engine", app_engine)
+    monkeypatch.setattr(connection, "health_engine", health_engine)
+    monkeypatch.setattr(CONFIG, "HEALTH_CHECK_TIMEOUT_SECONDS", 1.0)
+    readiness.reset()
+    try:
+        async with app_engine.connect():
+            await main.check_database()
+        assert readiness.database.ok
+    finally:
+        readiness.reset()
+        await app_engine.dispose()
+        await health_engine.dispose()
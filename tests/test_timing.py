@@ -0,0 +1,28 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.metrics import REGISTRY
+from app.core.timing import ServerTimingMiddleware
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_server_timing_breakdown(user_token):
+    transport = ASGITransport(app=ServerTimingMiddleware(app))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(
+            "/api/v1/users/me", headers={"Authorization": f"Bearer {user_token}"}
+        )
+
+    assert response.status_code == 200
+    stages = {
+        entry.split(";")[0].strip()
+        for entry in response.headers["Server-Timing"].split(",")
+    }
+    assert {"auth", "jwt", "db", "serialize", "total"} <= stages
+
+    exposition = REGISTRY.render()
+    assert (
+        'astra_request_stage_seconds_count{method="GET",route="/api/v1/users/me",'
+        'stage="db"}' in exposition
+    )
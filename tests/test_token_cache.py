@@ -0,0 +1,39 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from app.core import security
+from app.core.exceptions import InvalidTokenError, TokenExpiredError
+
+
+@pytest.mark.asyncio
+async def test_repeated_verification_hits_cache():
+    token = security.create_access_token({"sub": "testuser"})
+
+    first = security.verify_access_token(token)
+    second = security.verify_access_token(token)
+
+    assert first == second
+    assert security.token_cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_access_token_is_not_accepted_as_refresh():
+    token = security.create_access_token({"sub": "testuser"})
+    security.verify_access_token(token)
+
+    with pytest.raises(InvalidTokenError):
+        security.verify_refresh_token(token)
+
+
+@pytest.mark.asyncio
+async def test_expired_token_is_never_served_from_cache():
+    token = security.create_access_token(
+        {"sub": "testuser"}, expires_delta=timedelta(seconds=2)
+    )
+    security.verify_access_token(token)
+
+    await asyncio.sleep(2.1)
+    with pytest.raises(TokenExpiredError):
+        security.verify_access_token(token)
@@ -0,0 +1,122 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, update
+
+from app.db.crud import principal_cache
+from app.db.models.models import User
+from app.db.token_versions import token_versions
+
+
+@pytest.mark.asyncio
+async def test_role_check_served_from_claims(
+    client: AsyncClient, db_session, admin_token
+):
+    await token_versions.sync(db_session)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    # The token predates the first poll: one database read seeds the map.
+    for _ in range(3):
+        response = await client.get("/api/v1/admin/admin-dashboard", headers=headers)
+        assert response.status_code == 200
+    assert principal_cache.misses == 1
+    assert principal_cache.hits == 0
+
+
+@pytest.mark.asyncio
+async def test_unsynced_map_falls_back_to_database(client: AsyncClient, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    response = await client.get("/api/v1/admin/admin-dashboard", headers=headers)
+
+    assert response.status_code == 200
+    assert principal_cache.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_password_change_revokes_outstanding_tokens(
+    client: AsyncClient, db_session, test_user, user_token
+):
+    await token_versions.sync(db_session)
+    headers = {"Authorization": f"Bearer {user_token}"}
+
+    response = await client.patch(
+        "/api/v1/users/me", headers=headers, json={"password": "Changed1234"}
+    )
+    assert response.status_code == 200
+    assert not token_versions.is_current(test_user.id, 0)
+
+    for path in ("/api/v1/moderator/moderator-panel", "/api/v1/users/me"):
+        response = await client.get(path, headers=headers)
+        assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_email_change_keeps_tokens_valid(
+    client: AsyncClient, db_session, test_user, user_token
+):
+    await token_versions.sync(db_session)
+    headers = {"Authorization": f"Bearer {user_token}"}
+
+    response = await client.patch(
+        "/api/v1/users/me", headers=headers, json={"email": "new@example.com"}
+    )
+    assert response.status_code == 200
+    assert token_versions.is_current(test_user.id, 0)
+
+
+@pytest.mark.asyncio
+async def test_map_holds_only_seen_users_and_polls_invalidate_them(
+    client: AsyncClient, db_session, test_user, admin_user
+):
+    await token_versions.sync(db_session)
+    assert len(token_versions) == 0
+
+    response = await client.post(
+        "/api/v1/auth/login", data={"username": "testuser", "password": "Test1234"}
+    )
+    assert response.status_code == 200
+    assert len(token_versions) == 1
+
+    # Another worker bumps both users; only the one held here is tracked.
+    await db_session.execute(
+        update(User)
+        .where(User.id.in_([test_user.id, admin_user.id]))
+        .values(token_version=User.token_version + 1, updated_at=func.now())
+    )
+    await token_versions.sync(db_session)
+
+    assert token_versions.get(test_user.id) == 1
+    assert token_versions.get(admin_user.id) is None
+
+
+@pytest.mark.asyncio
+async def test_cached_principal_is_dropped_once_another_worker_bumps_version(
+    client: AsyncClient, db_session, admin_user, admin_token
+):
+    await token_versions.sync(db_session)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    # The token predates the first poll, so this caches the principal.
+    response = await client.get("/api/v1/admin/admin-dashboard", headers=headers)
+    assert response.status_code == 200
+    assert principal_cache.misses == 1
+
+    # Another worker demotes and deactivates the admin; this one only polls.
+    await db_session.execute(
+        update(User)
+        .where(User.id == admin_user.id)
+        .values(
+            role="user",
+            is_active=False,
+            token_version=User.token_version + 1,
+            updated_at=func.now(),
+        )
+    )
+    await token_versions.sync(db_session)
+
+    # Reloaded from the database: the account is now inactive.
+    response = await client.get("/api/v1/admin/admin-dashboard", headers=headers)
+    assert response.status_code == 403
+    response = await client.get(
+        "/api/v1/users/me", headers={**headers, "If-None-Match": "*"}
+    )
+    assert response.status_code == 403
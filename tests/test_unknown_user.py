@@ -0,0 +1,107 @@
+import time
+
+import pytest
+from httpx import AsyncClient
+
+from app.core import security
+from app.core.security import get_password_hash
+from app.db import crud
+from app.db.models.models import User
+from app.db.token_versions import token_versions
+
+
+async def _login(client: AsyncClient, username: str, password: str = "Wrong1234"):
+    return await client.post(
+        "/api/v1/auth/login", data={"username": username, "password": password}
+    )
+
+
+@pytest.mark.asyncio
+async def test_unknown_username_is_looked_up_once(client: AsyncClient, monkeypatch):
+    lookups = []
+    get_user_by_username = crud.get_user_by_username
+
+    async def counting_lookup(db, username):
+        lookups.append(username)
+        return await get_user_by_username(db, username)
+
+    monkeypatch.setattr(crud, "get_user_by_username", counting_lookup)
+
+    for _ in range(2):
+        assert (await _login(client, "ghost")).status_code == 401
+
+    assert lookups == ["ghost"]
+    assert "ghost" in crud.unknown_username_cache
+
+
+@pytest.mark.asyncio
+async def test_registration_clears_negative_entry(client: AsyncClient):
+    assert (await _login(client, "newcomer")).status_code == 401
+
+    response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "newcomer",
+            "email": "newcomer@example.com",
+            "password": "Newcomer1",
+        },
+    )
+    assert response.status_code == 201
+
+    assert (await _login(client, "newcomer", "Newcomer1")).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_calibrated_dummy_path_sleeps_instead_of_hashing(
+    client: AsyncClient, monkeypatch
+):
+    for _ in range(security.MIN_LATENCY_SAMPLES):
+        security.auth_latency.record(0.05)
+
+    async def no_hashing(*args):
+        raise AssertionError("unknown usernames must not hash once calibrated")
+
+    monkeypatch.setattr(security.hashing_pool, "run", no_hashing)
+
+    start = time.perf_counter()
+    assert (await _login(client, "ghost")).status_code == 401
+    assert time.perf_counter() - start >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_saturated_pool_sheds_unknown_and_known_usernames_alike(
+    client: AsyncClient, test_user, monkeypatch
+):
+    for _ in range(security.MIN_LATENCY_SAMPLES):
+        security.auth_latency.record(0.001)
+    monkeypatch.setattr(security.hashing_pool, "capacity", 0)
+
+    known = await _login(client, "testuser")
+    unknown = await _login(client, "ghost")
+
+    assert known.status_code == unknown.status_code == 503
+    assert known.json() == unknown.json()
+
+
+@pytest.mark.asyncio
+async def test_registration_on_another_worker_clears_negative_entry(
+    client: AsyncClient, db_session
+):
+    await token_versions.sync(db_session)
+    assert (await _login(client, "latecomer", "Late12345")).status_code == 401
+    assert "latecomer" in crud.unknown_username_cache
+
+    # Registered through another worker: this process's cache is not touched.
+    db_session.add(
+        User(
+            username="Latecomer",
+            email="late@example.com",
+            hashed_password=get_password_hash("Late12345"),
+            role="user",
+            is_active=True,
+        )
+    )
+    await db_session.flush()
+    await crud.sync_user_changes(db_session)
+
+    assert (await _login(client, "latecomer", "Late12345")).status_code == 200
@@ -1,6 +1,9 @@
 import pytest
 from httpx import AsyncClient
+from datetime import datetime, timezone
+
 from sqlalchemy import select
+from app.db import crud
 from app.db.models.models import User
 
 
@@ -19,8 +22,10 @@ async def test_delete_user_with_correct_password(
     )
     assert response.status_code == 204
 
-    # Verify user is deleted from database
-    result = await db_session.execute(select(User).filter_by(username="testuser"))
+    # Verify user is soft-deleted
+    result = await db_session.execute(
+        select(User).filter_by(username="testuser", deleted_at=None)
+    )
     deleted_user = result.scalar_one_or_none()
     assert deleted_user is None
 
@@ -59,8 +64,10 @@ async def test_delete_user_with_confirmation_text(
     )
     assert response.status_code == 204
 
-    # Verify user is deleted
-    result = await db_session.execute(select(User).filter_by(username="testuser"))
+    # Verify user is soft-deleted
+    result = await db_session.execute(
+        select(User).filter_by(username="testuser", deleted_at=None)
+    )
     deleted_user = result.scalar_one_or_none()
     assert deleted_user is None
 
@@ -163,8 +170,10 @@ async def test_multiple_users_deletion_isolation(
     )
     assert response.status_code == 204
 
-    # Verify test user is deleted
-    result = await db_session.execute(select(User).filter_by(username="testuser"))
+    # Verify test user is soft-deleted
+    result = await db_session.execute(
+        select(User).filter_by(username="testuser", deleted_at=None)
+    )
     deleted_user = result.scalar_one_or_none()
     assert deleted_user is None
 
@@ -172,3 +181,92 @@ async def test_multiple_users_deletion_isolation(
     result = await db_session.execute(select(User).filter_by(username="adminuser"))
     admin = result.scalar_one_or_none()
     assert admin is not None
+
+
+@pytest.mark.asyncio
+async def test_deleted_user_is_hidden_until_purged(
+    client: AsyncClient, test_user, user_token, db_session
+):
+    """Deleted accounts can't log in, free their username and are purged later"""
+    user_id = test_user.id
+    response = await client.request(
+        "DELETE",
+        "/api/v1/users/me",
+        headers={"Authorization": f"Bearer {user_token}"},
+        json={"password": "Test1234"},
+    )
+    assert response.status_code == 204
+
+    response = await client.get(
+        "/api/v1/users/me", headers={"Authorization": f"Bearer {user_token}"}
+    )
+    assert response.status_code == 401
+    response = await client.post(
+        "/api/v1/auth/login", data={"username": "testuser", "password": "Test1234"}
+    )
+    assert response.status_code == 401
+
+    response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "testuser",
+            "email": "test@example.com",
+            "password": "Test1234",
+        },
+    )
+    assert response.status_code == 201
+
+    purged = await crud.purge_deleted_users(
+        db_session, batch_size=10, older_than=datetime.now(timezone.utc)
+    )
+    assert purged == 1
+    result = await db_session.execute(select(User).filter_by(id=user_id))
+    assert result.scalar_one_or_none() is None
+
+
+@pytest.mark.asyncio
+async def test_tokens_of_deleted_user_do_not_carry_over_to_new_owner(
+    client: AsyncClient, test_user
+):
+    """Re-registering a deleted username must not revive the old account's tokens"""
+    tokens = (
+        await client.post(
+            "/api/v1/auth/login", data={"username": "testuser", "password": "Test1234"}
+        )
+    ).json()
+    response = await client.request(
+        "DELETE",
+        "/api/v1/users/me",
+        headers={"Authorization": f"Bearer {tokens['access_token']}"},
+        json={"password": "Test1234"},
+    )
+    assert response.status_code == 204
+
+    response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "testuser",
+            "email": "newowner@example.com",
+            "password": "Other1234",
+        },
+    )
+    assert response.status_code == 201
+    # Let the new owner's principal land in the cache the fallback reads from.
+    new_token = (
+        await client.post(
+            "/api/v1/auth/login", data={"username": "testuser", "password": "Other1234"}
+        )
+    ).json()["access_token"]
+    response = await client.get(
+        "/api/v1/users/me", headers={"Authorization": f"Bearer {new_token}"}
+    )
+    assert response.json()["email"] == "newowner@example.com"
+
+    old = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert (await client.get("/api/v1/users/me", headers=old)).status_code == 401
+    response = await client.patch("/api/v1/users/me", headers=old, json={})
+    assert response.status_code == 401
+    response = await client.post(
+        "/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 401
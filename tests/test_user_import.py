@@ -0,0 +1,182 @@
+import asyncio
+import json
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from app.core import security
+from app.core.exceptions import HashingPoolSaturatedError
+from app.db.models.models import User
+from app.services import user_import
+
+
+@pytest.mark.asyncio
+async def test_import_ndjson_reports_row_errors(
+    client: AsyncClient, admin_token, test_user, db_session
+):
+    rows = [
+        {"username": "bulk1", "email": "bulk1@example.com", "password": "Bulk1234"},
+        {"username": "bulk2", "email": "bulk2@example.com", "password": "weak"},
+        {"username": "testuser", "email": "dupe@example.com", "password": "Bulk1234"},
+        {"username": "bulk3", "email": "bulk3@example.com", "password": "Bulk1234"},
+    ]
+    body = "\n".join(json.dumps(row) for row in rows) + "\nnot json\n"
+
+    response = await client.post(
+        "/api/v1/admin/users/import?batch_size=2",
+        headers={
+            "Authorization": f"Bearer {admin_token}",
+            "Content-Type": "application/x-ndjson",
+        },
+        content=body,
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["total"] == 5
+    assert report["imported"] == 2
+    assert report["failed"] == 3
+    assert [error["line"] for error in report["errors"]] == [2, 3, 5]
+
+    result = await db_session.execute(
+        select(func.count()).where(User.username.in_(["bulk1", "bulk3"]))
+    )
+    assert result.scalar_one() == 2
+
+
+@pytest.mark.asyncio
+async def test_import_csv(client: AsyncClient, admin_token):
+    body = "username,email,password\ncsvuser,csv@example.com,Csv12345\n"
+    response = await client.post(
+        "/api/v1/admin/users/import",
+        headers={"Authorization": f"Bearer {admin_token}", "Content-Type": "text/csv"},
+        content=body,
+    )
+    assert response.status_code == 200
+    assert response.json()["imported"] == 1
+
+
+@pytest.mark.asyncio
+async def test_import_requires_admin(client: AsyncClient, user_token):
+    response = await client.post(
+        "/api/v1/admin/users/import",
+        headers={"Authorization": f"Bearer {user_token}"},
+        content="",
+    )
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_import_credits_the_row_that_was_inserted(
+    client: AsyncClient, admin_token, test_user
+):
+    rows = [
+        {"username": "twin", "email": "test@example.com", "password": "Twin1234"},
+        {"username": "twin", "email": "twin@example.com", "password": "Twin1234"},
+    ]
+    response = await client.post(
+        "/api/v1/admin/users/import",
+        headers={
+            "Authorization": f"Bearer {admin_token}",
+            "Content-Type": "application/x-ndjson",
+        },
+        content="\n".join(json.dumps(row) for row in rows),
+    )
+
+    report = response.json()
+    assert report["imported"] == 1
+    assert [error["line"] for error in report["errors"]] == [1]
+
+
+@pytest.mark.asyncio
+async def test_import_csv_quoted_newline(client: AsyncClient, admin_token):
+    body = (
+        'username,email,password\n"multi\nline",multi@example.com,Multi1234\n'
+        "csvuser,csv@example.com,Csv12345\n"
+    )
+    response = await client.post(
+        "/api/v1/admin/users/import",
+        headers={"Authorization": f"Bearer {admin_token}", "Content-Type": "text/csv"},
+        content=body,
+    )
+
+    report = response.json()
+    assert report["total"] == 2
+    assert report["imported"] == 1
+    # The quoted newline stays inside one record and fails username validation.
+    assert [error["line"] for error in report["errors"]] == [2]
+
+
+@pytest.mark.asyncio
+async def test_overlong_line_fails_only_its_record():
+    async def chunks():
+        yield b'{"a": 1}\n' + b"x" * 40
+        yield b"x" * 40 + b"\n"
+        yield b'{"b": 2}\n' + b"y" * 100
+
+    lines = [line async for line in user_import.iter_lines(chunks(), max_length=32)]
+    records = [
+        record async for record in user_import._iter_records(_aiter(lines), "ndjson")
+    ]
+
+    assert records == [
+        (1, {"a": 1}),
+        (2, "Line exceeds the maximum length"),
+        (3, {"b": 2}),
+        (4, "Line exceeds the maximum length"),
+    ]
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+@pytest.mark.asyncio
+async def test_bulk_hashing_waits_out_a_saturated_pool(monkeypatch):
+    monkeypatch.setattr(security.hashing_pool, "capacity", 0)
+    asyncio.get_running_loop().call_later(
+        0.2, setattr, security.hashing_pool, "capacity", 8
+    )
+
+    hashes = await security.hash_passwords_async(["Pass1234"] * 3, max_wait=5)
+
+    assert len(hashes) == 3
+
+
+@pytest.mark.asyncio
+async def test_import_reports_progress_when_hashing_stays_saturated(
+    client: AsyncClient, admin_token, monkeypatch
+):
+    hash_passwords_async = user_import.hash_passwords_async
+    calls = []
+
+    async def saturated_after_first_batch(passwords, **kwargs):
+        calls.append(len(passwords))
+        if len(calls) > 1:
+            raise HashingPoolSaturatedError()
+        return await hash_passwords_async(passwords, **kwargs)
+
+    monkeypatch.setattr(
+        user_import, "hash_passwords_async", saturated_after_first_batch
+    )
+    rows = [
+        {"username": f"sat{i}", "email": f"sat{i}@example.com", "password": "Sat12345"}
+        for i in range(5)
+    ]
+    # Rolls back the shared test transaction, so it has to be the last request.
+    response = await client.post(
+        "/api/v1/admin/users/import?batch_size=2",
+        headers={
+            "Authorization": f"Bearer {admin_token}",
+            "Content-Type": "application/x-ndjson",
+        },
+        content="\n".join(json.dumps(row) for row in rows),
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["imported"] == 2
+    assert report["aborted"] == HashingPoolSaturatedError.default_message
+    assert [error["line"] for error in report["errors"]] == [3, 4]